@@ -54,6 +54,11 @@ def main():
         action="store_true",
         help="Verbose output with progress information",
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the JSON databases (larger, slower to write)",
+    )
     parser.add_argument(
         "--force",
         action="store_true",
@@ -71,6 +76,7 @@ def main():
             stats_only=args.stats_only,
             verbose=args.verbose,
             force=args.force,
+            pretty=args.pretty,
         )
         success = disassembler.run()
         sys.exit(0 if success else 1)
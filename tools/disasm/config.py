@@ -123,6 +123,15 @@ MAX_STRING_LENGTH = 256
 # Minimum string length to consider valid
 MIN_STRING_LENGTH = 4
 
+# ASM listing writer: file buffer size and in-memory line buffer flush size
+ASM_WRITE_BUFFER = 1 << 20
+ASM_FLUSH_BYTES = 1 << 16
+
+# Minimum total instruction count before ASM listings are written by a
+# process pool (listing runs at ~1.6us per instruction; below this the
+# fork and pool startup cost more than the parallel writes save)
+ASM_PARALLEL_MIN_INSNS = 100000
+
 # ============================================================
 # Cache Settings
 # ============================================================
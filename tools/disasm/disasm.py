@@ -36,7 +36,8 @@ class Disassembler:
                  text_only: bool = False,
                  stats_only: bool = False,
                  verbose: bool = False,
-                 force: bool = False):
+                 force: bool = False,
+                 pretty: bool = False):
         self.xbe_path = xbe_path
         self.analysis_json = analysis_json
         self.output_dir = output_dir or config.DEFAULT_OUTPUT_DIR
@@ -44,6 +45,7 @@ class Disassembler:
         self.stats_only = stats_only
         self.verbose = verbose
         self.force = force
+        self.pretty = pretty
 
         # Components (initialized during run)
         self.image: Optional[BinaryImage] = None
@@ -185,7 +187,8 @@ class Disassembler:
             writer = OutputWriter(
                 self.output_dir, self.engine, self.func_detector,
                 self.xrefs, self.labels, self.image, self.strings)
-            writer.write_all(sections_to_disasm=sections, verbose=self.verbose)
+            writer.write_all(sections_to_disasm=sections, verbose=self.verbose,
+                             pretty=self.pretty)
 
             # Save cache
             json_path = self._find_analysis_json()
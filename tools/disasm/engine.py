@@ -6,6 +6,7 @@ with instruction classification and operand analysis.
 """
 
 import struct
+import sys
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set, Tuple
 
@@ -87,7 +88,9 @@ class DisasmEngine:
 
     def _classify_instruction(self, cs_insn: CsInsn) -> Instruction:
         """Convert a Capstone instruction to our Instruction type."""
-        mnemonic = cs_insn.mnemonic
+        # A few hundred distinct mnemonics repeat across millions of
+        # instructions; operand strings are too varied to be worth interning
+        mnemonic = sys.intern(cs_insn.mnemonic)
         insn = Instruction(
             address=cs_insn.address,
             size=cs_insn.size,
@@ -278,6 +281,19 @@ class DisasmEngine:
                 targets.add(insn.call_target)
         return targets
 
+    def get_referencing_instructions(self) -> List[Instruction]:
+        """
+        Return instructions that carry a resolved call, jump or memory target.
+
+        Most decoded instructions reference nothing, so xref building
+        filters them out here in one comprehension instead of testing
+        every instruction's flags individually.
+        """
+        return [insn for insn in self.instructions.values()
+                if insn.call_target is not None
+                or insn.jump_target is not None
+                or insn.memory_ref is not None]
+
     def get_indirect_call_refs(self) -> Dict[int, List[int]]:
         """
         Return memory addresses referenced by indirect calls.
@@ -5,6 +5,7 @@ Manages all named locations: kernel imports, string references,
 auto-named functions (sub_XXXXXXXX), and user-defined labels.
 """
 
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Set
@@ -30,9 +31,13 @@ class Label:
     section: str = ""
     confidence: float = 1.0
 
+    def __post_init__(self):
+        self.name = sys.intern(self.name)
+        self.section = sys.intern(self.section)
+
     def to_dict(self) -> dict:
         return {
-            "address": f"0x{self.address:08X}",
+            "address": "0x%08X" % self.address,
             "name": self.name,
             "type": self.label_type.value,
             "section": self.section,
@@ -70,6 +75,25 @@ class LabelManager:
         self._labels[label.address] = label
         self._names[label.name] = label.address
 
+    def add_many(self, labels: List[Label]) -> None:
+        """
+        Add a batch of labels.
+
+        When none of the addresses are already labelled (the usual case
+        for the kernel/string pre-population passes) the batch goes in
+        with two dict updates; otherwise each label goes through add()
+        so the normal conflict rules apply.
+        """
+        by_addr = {l.address: l for l in labels}
+        if (len(by_addr) != len(labels) or
+                not self._labels.keys().isdisjoint(by_addr)):
+            for label in labels:
+                self.add(label)
+            return
+
+        self._labels.update(by_addr)
+        self._names.update({l.name: l.address for l in labels})
+
     def get(self, address: int) -> Optional[Label]:
         """Get label at address."""
         return self._labels.get(address)
@@ -142,18 +166,18 @@ def populate_kernel_labels(labels: LabelManager, image: BinaryImage) -> int:
 
     Returns the number of kernel import labels added.
     """
-    count = 0
-    for ki in image.kernel_imports:
-        label = Label(
+    new_labels = [
+        Label(
             address=ki.thunk_addr,
             name=f"xbox_{ki.name}",
             label_type=LabelType.KERNEL_IMPORT,
             section=".rdata",
             confidence=1.0,
         )
-        labels.add(label)
-        count += 1
-    return count
+        for ki in image.kernel_imports
+    ]
+    labels.add_many(new_labels)
+    return len(new_labels)
 
 
 def populate_entry_point(labels: LabelManager, image: BinaryImage) -> None:
@@ -210,7 +234,7 @@ def extract_strings(image: BinaryImage, min_length: int = 4,
 def populate_string_labels(labels: LabelManager,
                            string_refs: List[dict]) -> int:
     """Add labels for string references."""
-    count = 0
+    new_labels = []
     for sr in string_refs:
         # Create a sanitized name from string content
         s = sr["string"][:32].replace(" ", "_").replace("/", "_")
@@ -220,12 +244,12 @@ def populate_string_labels(labels: LabelManager,
         else:
             s = f"str_{s}"
 
-        labels.add(Label(
+        new_labels.append(Label(
             address=sr["address"],
             name=s,
             label_type=LabelType.STRING_REF,
             section=".rdata",
             confidence=0.8,
         ))
-        count += 1
-    return count
+    labels.add_many(new_labels)
+    return len(new_labels)
@@ -7,6 +7,8 @@ BinaryImage interface for the disassembly engine.
 
 import json
 import struct
+import sys
+from functools import cached_property
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
@@ -24,6 +26,10 @@ class SectionInfo:
     executable: bool
     flags: str
 
+    def __post_init__(self):
+        self.name = sys.intern(self.name)
+        self.flags = sys.intern(self.flags)
+
 
 @dataclass
 class KernelImport:
@@ -51,13 +57,15 @@ class BinaryImage:
     sections: List[SectionInfo] = field(default_factory=list)
     kernel_imports: List[KernelImport] = field(default_factory=list)
 
-    # Lookup tables built after loading
-    _section_by_name: Dict[str, SectionInfo] = field(default_factory=dict, repr=False)
-    _thunk_to_import: Dict[int, KernelImport] = field(default_factory=dict, repr=False)
+    # Lookup tables, built on first use (tools that only need raw bytes
+    # never pay for them)
+    @cached_property
+    def _section_by_name(self) -> Dict[str, SectionInfo]:
+        return {s.name: s for s in self.sections}
 
-    def __post_init__(self):
-        self._section_by_name = {s.name: s for s in self.sections}
-        self._thunk_to_import = {ki.thunk_addr: ki for ki in self.kernel_imports}
+    @cached_property
+    def _thunk_to_import(self) -> Dict[int, KernelImport]:
+        return {ki.thunk_addr: ki for ki in self.kernel_imports}
 
     def get_section(self, name: str) -> Optional[SectionInfo]:
         """Get section by name."""
@@ -114,6 +122,10 @@ class BinaryImage:
         """Look up a kernel import by its thunk address."""
         return self._thunk_to_import.get(thunk_addr)
 
+    def kernel_thunk_map(self) -> Dict[int, KernelImport]:
+        """Return the thunk_addr -> KernelImport table for bulk lookups."""
+        return self._thunk_to_import
+
     def get_executable_sections(self) -> List[SectionInfo]:
         """Return all executable sections."""
         return [s for s in self.sections if s.executable]
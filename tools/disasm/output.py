@@ -7,10 +7,15 @@ Produces:
 """
 
 import json
+import locale
+import multiprocessing
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from . import config
 from .engine import DisasmEngine, Instruction
 from .functions import FunctionDetector, Function
 from .xrefs import XRefTracker
@@ -18,6 +23,23 @@ from .labels import LabelManager, Label
 from .loader import BinaryImage, SectionInfo
 
 
+# Writer for this ASM worker process, set once by the pool initializer
+_worker_writer: Optional["OutputWriter"] = None
+
+
+def _init_asm_worker(writer: "OutputWriter") -> None:
+    """Process pool initializer: keep the writer inherited through fork."""
+    global _worker_writer
+    _worker_writer = writer
+
+
+def _write_section_asm_worker(section: SectionInfo, asm_dir: Path,
+                              verbose: bool) -> str:
+    """Process pool entry point: write one section with the worker's writer."""
+    _worker_writer._write_section_asm(section, asm_dir, verbose)
+    return section.name
+
+
 class OutputWriter:
     """
     Generates all output files from the disassembly analysis.
@@ -34,11 +56,19 @@ class OutputWriter:
         self.labels = labels
         self.image = image
         self.strings = strings
+        self._json_kwargs: dict = {"separators": (",", ":")}
 
     def write_all(self, sections_to_disasm: Optional[List[SectionInfo]] = None,
-                  verbose: bool = False) -> None:
-        """Write all output files."""
+                  verbose: bool = False, pretty: bool = False) -> None:
+        """
+        Write all output files.
+
+        The large databases are written as compact JSON unless pretty is
+        set; summary.json is always indented since it is read by hand.
+        """
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._json_kwargs = ({"indent": 2} if pretty
+                             else {"separators": (",", ":")})
 
         if verbose:
             print(f"  Writing JSON databases to {self.output_dir}/")
@@ -56,8 +86,39 @@ class OutputWriter:
             if verbose:
                 print(f"  Writing ASM listings to {asm_dir}/")
 
-            for sec in sections_to_disasm:
+            self._write_sections_asm(sections_to_disasm, asm_dir, verbose)
+
+    def _write_sections_asm(self, sections: List[SectionInfo], asm_dir: Path,
+                            verbose: bool = False) -> None:
+        """
+        Write the ASM listing for each section.
+
+        Sections are independent, so large binaries (at least
+        config.ASM_PARALLEL_MIN_INSNS instructions) write them in a process
+        pool. Workers are forked on Linux so they inherit the engine/xref/
+        label tables instead of pickling them; the writer reaches them as
+        a fork-inherited initializer argument. Elsewhere, and for small
+        binaries where starting the pool costs more than it saves, the
+        sections are written serially.
+        """
+        workers = min(len(sections), os.cpu_count() or 1)
+        if (workers < 2 or not sys.platform.startswith("linux") or
+                self.engine.instruction_count()
+                < config.ASM_PARALLEL_MIN_INSNS):
+            for sec in sections:
                 self._write_section_asm(sec, asm_dir, verbose)
+            return
+
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_asm_worker, initargs=(self,)) as ex:
+            futures = [
+                ex.submit(_write_section_asm_worker, sec, asm_dir, verbose)
+                for sec in sections
+            ]
+            for fut in futures:
+                fut.result()
 
     def _write_summary(self) -> None:
         """Write summary.json with statistics."""
@@ -97,20 +158,20 @@ class OutputWriter:
         funcs = sorted(self.functions.functions.values(), key=lambda f: f.start)
         data = [f.to_dict() for f in funcs]
         with open(self.output_dir / "functions.json", 'w') as f:
-            json.dump(data, f, indent=2)
+            json.dump(data, f, **self._json_kwargs)
 
     def _write_xrefs_json(self) -> None:
         """Write xrefs.json with all cross-references."""
         data = self.xrefs.to_list()
         with open(self.output_dir / "xrefs.json", 'w') as f:
-            json.dump(data, f, indent=2)
+            json.dump(data, f, **self._json_kwargs)
 
     def _write_strings_json(self) -> None:
         """Write strings.json with string references."""
         data = []
         for s in self.strings:
             entry = {
-                "address": f"0x{s['address']:08X}",
+                "address": "0x%08X" % s["address"],
                 "string": s["string"],
                 "length": s["length"],
             }
@@ -118,22 +179,30 @@ class OutputWriter:
             refs_to = self.xrefs.get_refs_to(s["address"])
             if refs_to:
                 entry["referenced_from"] = [
-                    f"0x{r.from_addr:08X}" for r in refs_to
+                    "0x%08X" % r.from_addr for r in refs_to
                 ]
             data.append(entry)
 
         with open(self.output_dir / "strings.json", 'w') as f:
-            json.dump(data, f, indent=2)
+            json.dump(data, f, **self._json_kwargs)
 
     def _write_labels_json(self) -> None:
         """Write labels.json with all named symbols."""
         data = self.labels.to_list()
         with open(self.output_dir / "labels.json", 'w') as f:
-            json.dump(data, f, indent=2)
+            json.dump(data, f, **self._json_kwargs)
 
     def _write_section_asm(self, section: SectionInfo, asm_dir: Path,
                            verbose: bool = False) -> None:
-        """Write a human-readable ASM listing for a section."""
+        """
+        Write a human-readable ASM listing for a section.
+
+        Lines are formatted straight to bytes with %-style formatting and
+        accumulated in one reusable buffer, so the file object never has
+        to encode a str per line. Text-mode output is kept: strings are
+        encoded with the locale encoding and newlines are translated to
+        os.linesep at each flush.
+        """
         safe_name = section.name.replace('$', '').replace('.', '')
         if not safe_name:
             safe_name = f"section_{section.virtual_addr:08X}"
@@ -142,27 +211,32 @@ class OutputWriter:
         if verbose:
             print(f"    {filename}...")
 
-        insns = self.engine.get_instructions_in_range(
-            section.virtual_addr,
-            section.virtual_addr + section.virtual_size
-        )
+        sec_start = section.virtual_addr
+        sec_end = sec_start + section.virtual_size
+        insns = self.engine.get_instructions_in_range(sec_start, sec_end)
 
         funcs_in_section = self.functions.get_functions_in_section(section.name)
         func_starts = {f.start for f in funcs_in_section}
         func_ends = {f.end for f in funcs_in_section}
         func_by_start = {f.start: f for f in funcs_in_section}
 
-        with open(asm_dir / filename, 'w') as f:
+        encoding = locale.getpreferredencoding(False)
+        linesep = os.linesep.encode(encoding)
+        rule = b"; " + b"=" * 60 + b"\n"
+        flush_at = config.ASM_FLUSH_BYTES
+        buf = bytearray()
+
+        with open(asm_dir / filename, 'wb',
+                  buffering=config.ASM_WRITE_BUFFER) as f:
             # Header
-            f.write(f"; ============================================================\n")
-            f.write(f"; Section: {section.name}\n")
-            f.write(f"; VA: 0x{section.virtual_addr:08X} - "
-                    f"0x{section.virtual_addr + section.virtual_size:08X}\n")
-            f.write(f"; Size: {section.virtual_size} bytes "
-                    f"({section.virtual_size / 1024:.1f} KB)\n")
-            f.write(f"; Functions: {len(funcs_in_section)}\n")
-            f.write(f"; Instructions: {len(insns)}\n")
-            f.write(f"; ============================================================\n\n")
+            buf += rule
+            buf += b"; Section: %s\n" % section.name.encode(encoding)
+            buf += b"; VA: 0x%08X - 0x%08X\n" % (sec_start, sec_end)
+            buf += b"; Size: %d bytes (%.1f KB)\n" % (
+                section.virtual_size, section.virtual_size / 1024)
+            buf += b"; Functions: %d\n" % len(funcs_in_section)
+            buf += b"; Instructions: %d\n" % len(insns)
+            buf += rule + b"\n"
 
             for insn in insns:
                 addr = insn.address
@@ -170,12 +244,14 @@ class OutputWriter:
                 # Function boundary markers
                 if addr in func_starts:
                     func = func_by_start[addr]
-                    f.write(f"\n; {'=' * 60}\n")
-                    f.write(f"; Function: {func.name}\n")
-                    f.write(f"; Start: 0x{func.start:08X}  End: 0x{func.end:08X}  "
-                            f"Size: {func.size} bytes\n")
-                    f.write(f"; Detection: {func.detection_method} "
-                            f"(confidence: {func.confidence:.2f})\n")
+                    name = func.name.encode(encoding)
+                    buf += b"\n" + rule
+                    buf += b"; Function: %s\n" % name
+                    buf += b"; Start: 0x%08X  End: 0x%08X  Size: %d bytes\n" % (
+                        func.start, func.end, func.size)
+                    buf += b"; Detection: %s (confidence: %.2f)\n" % (
+                        func.detection_method.encode(encoding),
+                        func.confidence)
                     if func.calls_to:
                         callees = ", ".join(
                             self.labels.get_display_name(a)
@@ -183,7 +259,7 @@ class OutputWriter:
                         )
                         if len(func.calls_to) > 10:
                             callees += f" ... (+{len(func.calls_to) - 10} more)"
-                        f.write(f"; Calls: {callees}\n")
+                        buf += b"; Calls: %s\n" % callees.encode(encoding)
                     if func.called_by:
                         callers = ", ".join(
                             self.labels.get_display_name(a)
@@ -191,26 +267,27 @@ class OutputWriter:
                         )
                         if len(func.called_by) > 10:
                             callers += f" ... (+{len(func.called_by) - 10} more)"
-                        f.write(f"; Called by: {callers}\n")
-                    f.write(f"; {'=' * 60}\n")
-                    f.write(f"{func.name}:\n")
+                        buf += b"; Called by: %s\n" % callers.encode(encoding)
+                    buf += rule
+                    buf += b"%s:\n" % name
 
                 # Label for non-function addresses
                 elif self.labels.has(addr):
                     label = self.labels.get(addr)
-                    f.write(f"\n{label.name}:\n")
+                    buf += b"\n%s:\n" % label.name.encode(encoding)
 
                 # Xref comments
                 refs_to = self.xrefs.get_refs_to(addr)
                 if refs_to and addr not in func_starts:
-                    ref_strs = []
-                    for ref in refs_to[:5]:
-                        ref_strs.append(
-                            f"0x{ref.from_addr:08X} ({ref.xref_type.value})")
+                    ref_strs = [
+                        "0x%08X (%s)" % (ref.from_addr, ref.xref_type.value)
+                        for ref in refs_to[:5]
+                    ]
                     if len(refs_to) > 5:
                         ref_strs.append(f"... (+{len(refs_to) - 5} more)")
-                    f.write(f"                                        "
-                            f"; XREF: {', '.join(ref_strs)}\n")
+                    buf += (b"                                        "
+                            b"; XREF: %s\n"
+                            % ", ".join(ref_strs).encode(encoding))
 
                 # The instruction itself
                 # Format: ADDR  BYTES                MNEMONIC  OPERANDS  ; comment
@@ -233,14 +310,24 @@ class OutputWriter:
                     if not target_name.startswith("0x"):
                         comment = f"; -> {target_name}"
 
-                f.write(
-                    f"  0x{addr:08X}  {bytes_str:<22s}  "
-                    f"{insn.mnemonic:<8s} {insn.op_str:<30s} {comment}\n"
-                )
+                buf += b"  0x%08X  %-22s  %-8s %-30s %s\n" % (
+                    addr, bytes_str.encode(encoding),
+                    insn.mnemonic.encode(encoding),
+                    insn.op_str.encode(encoding), comment.encode(encoding))
 
                 # Function end marker
                 if addr + insn.size in func_ends:
-                    f.write(f"; end of function\n")
+                    buf += b"; end of function\n"
+
+                if len(buf) >= flush_at:
+                    if linesep != b"\n":
+                        buf = buf.replace(b"\n", linesep)
+                    f.write(buf)
+                    buf.clear()
+
+            if linesep != b"\n":
+                buf = buf.replace(b"\n", linesep)
+            f.write(buf)
 
 
 def print_stats(engine: DisasmEngine, functions: FunctionDetector,
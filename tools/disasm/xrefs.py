@@ -7,7 +7,7 @@ data references, and kernel import usage.
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from .engine import DisasmEngine, Instruction
 from .loader import BinaryImage
@@ -21,9 +21,14 @@ class XRefType(Enum):
     KERNEL_CALL = "kernel_call" # Call through kernel thunk
 
 
-@dataclass
+@dataclass(slots=True)
 class XRef:
-    """A single cross-reference."""
+    """
+    A single cross-reference.
+
+    Slotted: a large binary produces hundreds of thousands of these, and
+    dropping the per-instance __dict__ cuts their memory roughly in half.
+    """
     from_addr: int
     to_addr: int
     xref_type: XRefType
@@ -54,10 +59,17 @@ class XRefTracker:
         # Kernel import call sites: thunk_addr -> list of calling addresses
         self._kernel_calls: Dict[int, List[int]] = {}
 
+        # Running totals so count()/count_by_type() never walk the tables
+        self._count = 0
+        self._type_counts: Dict[XRefType, int] = {}
+
     def add(self, xref: XRef) -> None:
         """Add a cross-reference."""
         self._from.setdefault(xref.from_addr, []).append(xref)
         self._to.setdefault(xref.to_addr, []).append(xref)
+        self._count += 1
+        self._type_counts[xref.xref_type] = (
+            self._type_counts.get(xref.xref_type, 0) + 1)
 
     def get_refs_from(self, addr: int) -> List[XRef]:
         """Get all references originating from an address."""
@@ -86,15 +98,10 @@ class XRefTracker:
         return dict(self._kernel_calls)
 
     def count(self) -> int:
-        return sum(len(refs) for refs in self._from.values())
+        return self._count
 
     def count_by_type(self) -> Dict[str, int]:
-        counts: Dict[str, int] = {}
-        for refs in self._from.values():
-            for r in refs:
-                key = r.xref_type.value
-                counts[key] = counts.get(key, 0) + 1
-        return counts
+        return {t.value: n for t, n in self._type_counts.items()}
 
     def to_list(self) -> List[dict]:
         """Export all xrefs as a flat list of dicts, sorted by from_addr."""
@@ -105,6 +112,57 @@ class XRefTracker:
         return result
 
 
+def _collect_xrefs(insns: List[Instruction],
+                   thunk_get: Callable) -> List[XRef]:
+    """
+    Create the XRef entries for a run of referencing instructions.
+
+    The engine resolves at most one target per instruction
+    (call_target/jump_target vs. memory_ref), so a single if/elif chain
+    covers every case.
+    """
+    xrefs = []
+    append = xrefs.append
+
+    for insn in insns:
+        addr = insn.address
+        mref = insn.memory_ref
+
+        if insn.is_call:
+            ctgt = insn.call_target
+            if ctgt is not None:
+                # Direct call
+                append(XRef(addr, ctgt, XRefType.CALL))
+            else:
+                # Indirect call through memory (kernel thunks)
+                ki = thunk_get(mref)
+                if ki is not None:
+                    append(XRef(addr, mref, XRefType.KERNEL_CALL,
+                                kernel_name=ki.name))
+                else:
+                    # Indirect call to non-kernel memory address
+                    append(XRef(addr, mref, XRefType.CALL))
+
+        elif insn.is_jump or insn.is_cond_jump:
+            jtgt = insn.jump_target
+            if jtgt is not None:
+                # Direct / conditional jumps
+                xtype = XRefType.JUMP if insn.is_jump else XRefType.COND_JUMP
+                append(XRef(addr, jtgt, xtype))
+            else:
+                # Indirect jumps through memory (e.g., switch tables, thunks)
+                ki = thunk_get(mref)
+                if ki is not None:
+                    append(XRef(addr, mref, XRefType.KERNEL_CALL,
+                                kernel_name=ki.name))
+
+        elif mref is not None:
+            # Data references (non-branch memory operands)
+            append(XRef(addr, mref, XRefType.DATA_READ))
+
+    return xrefs
+
+
 def build_xrefs(engine: DisasmEngine, image: BinaryImage) -> XRefTracker:
     """
     Build the complete cross-reference database from decoded instructions.
@@ -125,72 +183,20 @@ def build_xrefs(engine: DisasmEngine, image: BinaryImage) -> XRefTracker:
     """
     tracker = XRefTracker()
 
-    for insn in engine.instructions.values():
-        # Direct calls
-        if insn.is_call and insn.call_target is not None:
-            tracker.add(XRef(
-                from_addr=insn.address,
-                to_addr=insn.call_target,
-                xref_type=XRefType.CALL,
-            ))
-
-        # Indirect calls through memory (kernel thunks)
-        if insn.is_call and insn.memory_ref is not None:
-            ki = image.get_kernel_import_at_thunk(insn.memory_ref)
-            if ki is not None:
-                xref = XRef(
-                    from_addr=insn.address,
-                    to_addr=insn.memory_ref,
-                    xref_type=XRefType.KERNEL_CALL,
-                    kernel_name=ki.name,
-                )
-                tracker.add(xref)
-                tracker._kernel_calls.setdefault(
-                    insn.memory_ref, []).append(insn.address)
-            else:
-                # Indirect call to non-kernel memory address
-                tracker.add(XRef(
-                    from_addr=insn.address,
-                    to_addr=insn.memory_ref,
-                    xref_type=XRefType.CALL,
-                ))
-
-        # Indirect jumps through memory (e.g., switch tables, thunks)
-        if (insn.is_jump or insn.is_cond_jump) and insn.memory_ref is not None:
-            ki = image.get_kernel_import_at_thunk(insn.memory_ref)
-            if ki is not None:
-                xref = XRef(
-                    from_addr=insn.address,
-                    to_addr=insn.memory_ref,
-                    xref_type=XRefType.KERNEL_CALL,
-                    kernel_name=ki.name,
-                )
-                tracker.add(xref)
-                tracker._kernel_calls.setdefault(
-                    insn.memory_ref, []).append(insn.address)
-
-        # Direct jumps
-        if insn.is_jump and insn.jump_target is not None:
-            tracker.add(XRef(
-                from_addr=insn.address,
-                to_addr=insn.jump_target,
-                xref_type=XRefType.JUMP,
-            ))
-
-        # Conditional jumps
-        if insn.is_cond_jump and insn.jump_target is not None:
-            tracker.add(XRef(
-                from_addr=insn.address,
-                to_addr=insn.jump_target,
-                xref_type=XRefType.COND_JUMP,
-            ))
-
-        # Data references (non-branch memory operands)
-        if not (insn.is_call or insn.is_branch) and insn.memory_ref is not None:
-            tracker.add(XRef(
-                from_addr=insn.address,
-                to_addr=insn.memory_ref,
-                xref_type=XRefType.DATA_READ,
-            ))
+    # Resolve kernel thunks straight from the table instead of going
+    # through a BinaryImage method call per instruction
+    thunk_get = image.kernel_thunk_map().get
+
+    # Every xref needs a resolved target, so only visit instructions
+    # that have one
+    insns = engine.get_referencing_instructions()
+
+    xrefs = _collect_xrefs(insns, thunk_get)
+
+    kernel_calls = tracker._kernel_calls
+    for xref in xrefs:
+        tracker.add(xref)
+        if xref.xref_type is XRefType.KERNEL_CALL:
+            kernel_calls.setdefault(xref.to_addr, []).append(xref.from_addr)
 
     return tracker
@@ -36,6 +36,12 @@ def main():
         "--output", "-o",
         help="Output directory (default: tools/func_id/output)"
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Keep pickled copies of the JSON inputs in the output directory "
+             "and reuse them while the inputs are unchanged"
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -52,6 +58,7 @@ def main():
             xrefs_path=args.xrefs,
             output_dir=args.output,
             verbose=args.verbose,
+            use_cache=args.cache,
         )
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
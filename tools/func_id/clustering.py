@@ -10,18 +10,52 @@ Strategies:
 - Proximity: unlabeled functions between same-category functions inherit label
 """
 
+import random
+from array import array
+from bisect import bisect_right
 from collections import defaultdict
 
 from . import config
 
 
-def propagate_labels(functions, rw_results, crt_results, imm_refs, strings,
-                     verbose=False):
+# Game sub-category keywords flattened into one (keyword, category index)
+# table, so each function's text is tested in a single pass instead of
+# one generator per category
+_GAME_CATEGORIES = list(config.GAME_SUBCATEGORIES)
+_GAME_KEYWORD_TABLE = [
+    (kw, i)
+    for i, cat in enumerate(_GAME_CATEGORIES)
+    for kw in config.GAME_SUBCATEGORIES[cat]
+]
+
+# Label kinds stored per node in propagate_labels' label_kind bytearray
+_UNLABELED = 0
+_KIND_RW = 1
+_KIND_CRT = 2
+_KIND_GAME = 3
+_KIND_OTHER = 4
+
+# Sub-category votes are scored as count * _RANK_SPAN - first-seen rank,
+# so the highest score is the most common label, the earliest seen among
+# ties (what max() over the counts in insertion order picks). Scores
+# only grow, so the winner can be tracked while counting. Any bound above
+# a row's length works.
+_RANK_SPAN = 1 << 32
+
+# XDK section ranges (lo, hi, category) sorted by start, so a call target
+# is resolved with one bisect. The sections are disjoint.
+_XDK_RANGES = sorted(config.XDK_SECTIONS.values())
+_XDK_STARTS = [lo for lo, _, _ in _XDK_RANGES]
+
+
+def propagate_labels(functions, func_addrs, rw_results, crt_results, imm_refs,
+                     strings, verbose=False):
     """
     Propagate category labels through the call graph and by proximity.
 
     Args:
         functions: List of function dicts (with calls_to, called_by).
+        func_addrs: Start address (int) of each function in functions.
         rw_results: Dict func_addr -> RW identification info.
         crt_results: Dict func_addr -> CRT identification info.
         imm_refs: Dict rdata_addr -> [func_addr, ...].
@@ -36,144 +70,301 @@ def propagate_labels(functions, rw_results, crt_results, imm_refs, strings,
             "method": str
         }
         This includes new classifications found by propagation only.
+        In verbose mode it also holds "_meta": {"iterations": int,
+        "history": [new labels per majority-vote iteration, ...]}.
     """
-    # Build lookup structures
-    func_by_addr = {}
-    for f in functions:
-        addr = int(f["start"], 16)
-        func_by_addr[addr] = f
-
-    # Build call graph
-    callees = defaultdict(set)
-    callers = defaultdict(set)
-    for f in functions:
-        addr = int(f["start"], 16)
-        for target in f.get("calls_to", []):
-            t = int(target, 16)
-            callees[addr].add(t)
-            callers[t].add(addr)
-
-    # Current labels: merge RW and CRT results
-    labels = {}
+    # Build the call graph over dense node numbers shared by every pass:
+    # function starts in address order (so a node number is also the
+    # position in sorted_addrs), then any call targets that are not
+    # function starts
+    sorted_addrs = sorted(set(func_addrs))
+    n_funcs = len(sorted_addrs)
+    node_addrs, node_index, callee_graph, caller_graph = _build_call_graph(
+        functions, func_addrs, sorted_addrs)
+    callee_ptr, callee_idx = callee_graph
+    caller_ptr, caller_idx = caller_graph
+
+    # Current labels per node: merge RW and CRT results. label_kind is a
+    # small int code per node (_UNLABELED, _KIND_RW, ...) so "is labeled"
+    # is one byte test; rw_by_node holds the RW sub-category of RW nodes
+    # (None otherwise), so the hot loops test a neighbour with one list
+    # index instead of a dict lookup plus .startswith("rw_"). Both are
+    # kept in step on every assignment.
+    label_kind = bytearray(len(node_addrs))
+    rw_by_node = [None] * len(node_addrs)
     for addr, info in rw_results.items():
-        labels[addr] = info["category"]
-    for addr, info in crt_results.items():
-        labels[addr] = "crt"
+        i = node_index.get(addr)
+        if i is not None:
+            category = info["category"]
+            if category.startswith("rw_"):
+                label_kind[i] = _KIND_RW
+                rw_by_node[i] = category
+            else:
+                label_kind[i] = _KIND_OTHER
+    for addr in crt_results:
+        i = node_index.get(addr)
+        if i is not None:
+            label_kind[i] = _KIND_CRT
+            rw_by_node[i] = None
 
     # Build string ref map for game sub-classification
     string_refs = _build_string_ref_map(imm_refs, strings)
 
-    propagated = {}
-    sorted_addrs = sorted(func_by_addr.keys())
-
-    # Iterative propagation with majority voting
+    # New classifications as (addr, category, subcategory, confidence,
+    # method) tuples; turned into the result dicts once at the end
+    new_entries = []
+
+    # Majority-vote candidates: functions with at least two callers
+    # (forward) or callees (backward), in address order
+    forward_nodes = [i for i in range(n_funcs)
+                     if caller_ptr[i + 1] - caller_ptr[i] >= 2
+                     and not label_kind[i]]
+    backward_nodes = [i for i in range(n_funcs)
+                      if callee_ptr[i + 1] - callee_ptr[i] >= 2
+                      and not label_kind[i]]
+
+    # A vote can only change once a neighbour gains a label, so each
+    # candidate is re-evaluated only while flagged dirty. Labeling a node
+    # flags its callees for the forward vote and its callers for the
+    # backward vote; flags raised ahead of the current position are seen
+    # in the same pass, exactly as a full re-scan would see them.
+    forward_dirty = bytearray(b"\x01") * len(node_addrs)
+    backward_dirty = bytearray(b"\x01") * len(node_addrs)
+    marks = ((callee_graph, forward_dirty), (caller_graph, backward_dirty))
+
+    # Iterative propagation with majority voting, until the vote settles
+    settle_threshold = max(config.CLUSTER_SETTLE_MIN_LABELS,
+                           config.CLUSTER_SETTLE_FRACTION * len(functions))
+    history = []
+    shuffle = None
+    if config.CLUSTER_SHUFFLE_SEED is not None:
+        shuffle = random.Random(config.CLUSTER_SHUFFLE_SEED).shuffle
     for iteration in range(config.MAX_CLUSTER_ITERATIONS):
-        new_labels = 0
+        if shuffle is not None:
+            shuffle(forward_nodes)
+            shuffle(backward_nodes)
 
         # Forward: if >= 2/3 of callers have the same RW label → propagate
-        for addr in sorted_addrs:
-            if addr in labels:
-                continue
-            caller_set = callers.get(addr, set())
-            if len(caller_set) < 2:
-                continue
-
-            rw_count = 0
-            rw_subcounts = defaultdict(int)
-            for c in caller_set:
-                if c in labels and labels[c].startswith("rw_"):
-                    rw_count += 1
-                    rw_subcounts[labels[c]] += 1
-
-            # Require >= 2/3 of callers to be RW, minimum 2 RW callers
-            if rw_count >= 2 and rw_count / len(caller_set) >= 0.67:
-                best = max(rw_subcounts, key=rw_subcounts.get)
-                labels[addr] = best
-                propagated[addr] = {
-                    "category": best,
-                    "subcategory": None,
-                    "confidence": config.CONFIDENCE_CLUSTER_CALL,
-                    "method": "cluster_forward",
-                }
-                new_labels += 1
+        new_labels = _majority_vote_pass(
+            forward_nodes, caller_graph, forward_dirty, marks,
+            sorted_addrs, label_kind, rw_by_node, new_entries,
+            "cluster_forward")
 
         # Backward: if >= 2/3 of callees are RW → propagate
-        for addr in sorted_addrs:
-            if addr in labels:
-                continue
-            callee_set = callees.get(addr, set())
-            if len(callee_set) < 2:
-                continue
+        new_labels += _majority_vote_pass(
+            backward_nodes, callee_graph, backward_dirty, marks,
+            sorted_addrs, label_kind, rw_by_node, new_entries,
+            "cluster_backward")
+
+        if new_labels:
+            forward_nodes = [i for i in forward_nodes
+                             if not label_kind[i]]
+            backward_nodes = [i for i in backward_nodes
+                              if not label_kind[i]]
 
-            rw_count = 0
-            rw_subcounts = defaultdict(int)
-            for c in callee_set:
-                if c in labels and labels[c].startswith("rw_"):
-                    rw_count += 1
-                    rw_subcounts[labels[c]] += 1
-
-            if rw_count >= 2 and rw_count / len(callee_set) >= 0.67:
-                best = max(rw_subcounts, key=rw_subcounts.get)
-                labels[addr] = best
-                propagated[addr] = {
-                    "category": best,
-                    "subcategory": None,
-                    "confidence": config.CONFIDENCE_CLUSTER_CALL,
-                    "method": "cluster_backward",
-                }
-                new_labels += 1
+        history.append(new_labels)
 
         if verbose:
             print(f"  Iteration {iteration + 1}: {new_labels} new labels")
 
         if new_labels == 0:
             break
+        if len(history) >= 2 and max(history[-2:]) < settle_threshold:
+            break
 
     # RW region call-graph propagation: within the RW code region,
     # propagate RW labels more aggressively (any connection suffices).
     # The linker places RW code together, so functions in this region
     # connected to known RW functions are very likely RW.
     rw_region_count = _rw_region_propagation(
-        sorted_addrs, labels, propagated, callees, callers
+        sorted_addrs, label_kind, rw_by_node, new_entries,
+        callee_graph, caller_graph
     )
     if verbose:
         print(f"  RW region propagation: {rw_region_count} new labels")
 
-    # Iterative proximity propagation - each pass can fill one more layer
+    # Iterative proximity propagation - each pass can fill one more layer.
+    # The first pass sweeps every unlabeled interior position; later
+    # passes only revisit the positions whose outcome can have changed.
+    # The RW code bounds can't move during these passes (every label they
+    # add lies between existing neighbours), so they are found once.
+    rw_positions = _rw_positions(rw_by_node, n_funcs)
+    if rw_positions:
+        rw_code_lo = sorted_addrs[rw_positions[0]]
+        rw_code_hi = sorted_addrs[rw_positions[-1]]
+    else:
+        rw_code_lo = rw_code_hi = 0
+    prox_candidates = [i for i in range(1, n_funcs - 1)
+                       if not label_kind[i]]
+    prox_unlabeled = len(prox_candidates)
     total_prox = 0
     for prox_pass in range(20):
-        prox_count = _proximity_propagation(sorted_addrs, labels, propagated)
+        prox_count, prox_candidates = _proximity_propagation(
+            sorted_addrs, prox_candidates, rw_code_lo, rw_code_hi,
+            label_kind, rw_by_node, new_entries)
         total_prox += prox_count
-        if prox_count == 0:
+        if prox_count == 0 or total_prox == prox_unlabeled:
             break
     if verbose:
         print(f"  Proximity propagation: {total_prox} new labels ({prox_pass + 1} passes)")
 
-    # RW API consumer detection: game functions that call RW functions
-    rw_consumer_count = _classify_rw_consumers(
-        sorted_addrs, labels, propagated, callees
+    # Remaining single-pass rules, applied in one sweep in this order:
+    # RW API consumers (game functions that call RW functions), XDK
+    # library section callers, then game sub-classification via string
+    # references
+    rw_consumer_count, xdk_caller_count, game_sub_count = _classify_unlabeled(
+        sorted_addrs, node_addrs, label_kind, rw_by_node, new_entries,
+        callee_graph, string_refs
     )
     if verbose:
         print(f"  RW API consumers: {rw_consumer_count} functions")
-
-    # XDK library section caller detection
-    xdk_caller_count = _classify_xdk_callers(
-        sorted_addrs, labels, propagated, callees
-    )
-    if verbose:
         print(f"  XDK section callers: {xdk_caller_count} functions")
-
-    # Game sub-classification via string references
-    game_sub_count = _classify_game_subcategories(
-        sorted_addrs, labels, propagated, string_refs
-    )
-    if verbose:
         print(f"  Game sub-classification: {game_sub_count} functions categorized")
 
+    propagated = {
+        addr: {
+            "category": category,
+            "subcategory": subcategory,
+            "confidence": confidence,
+            "method": method,
+        }
+        for addr, category, subcategory, confidence, method in new_entries
+    }
+    if verbose:
+        propagated["_meta"] = {"iterations": len(history),
+                               "history": history}
     return propagated
 
 
-def _rw_region_propagation(sorted_addrs, labels, propagated, callees, callers):
+def _majority_vote_pass(nodes, graph, dirty, marks, sorted_addrs, label_kind,
+                        rw_by_node, new_entries, method):
+    """
+    One majority-vote pass over the dirty nodes among nodes, in order.
+
+    An unlabeled function takes the most common RW sub-category among its
+    neighbours (its row in graph) when at least 2 of them, and >= 2/3 of
+    all of them, are RW. Labels assigned earlier in the pass count for
+    later nodes. Evaluating a node clears its dirty flag; labeling one
+    raises the flags of its dependents through marks, a sequence of
+    (dependent graph, dirty flags) pairs.
+
+    Returns the number of new labels.
+    """
+    confidence = config.CONFIDENCE_CLUSTER_CALL
+    ptr, idx = graph
+    count = 0
+    for node in nodes:
+        if not dirty[node] or label_kind[node]:
+            continue
+        dirty[node] = 0
+
+        # Neighbour labels gathered by a comprehension and counted with
+        # list.count, so most nodes are rejected without a Python-level
+        # loop; the winner is only worked out for nodes that pass
+        row = idx[ptr[node]:ptr[node + 1]]
+        neighbour_labels = [rw_by_node[c] for c in row]
+        rw_count = len(row) - neighbour_labels.count(None)
+
+        # Require >= 2/3 of neighbours to be RW (0.67 as an exact integer
+        # ratio), minimum 2 RW neighbours
+        if rw_count < 2 or 100 * rw_count < 67 * len(row):
+            continue
+
+        best = _vote_winner(neighbour_labels)
+        label_kind[node] = _KIND_RW
+        rw_by_node[node] = best
+        new_entries.append((sorted_addrs[node], best, None,
+                            confidence, method))
+        count += 1
+        for (dep_ptr, dep_idx), flags in marks:
+            for t in dep_idx[dep_ptr[node]:dep_ptr[node + 1]]:
+                flags[t] = 1
+
+    return count
+
+
+def _vote_winner(neighbour_labels, default=None):
+    """
+    Most common RW sub-category among neighbour labels (None = not RW).
+
+    Ties go to the label seen first. Returns default if none are RW.
+    """
+    scores = {}
+    best, best_score = default, 0
+    for lbl in neighbour_labels:
+        if lbl is not None:
+            score = scores.get(lbl)
+            score = (_RANK_SPAN - len(scores) if score is None
+                     else score + _RANK_SPAN)
+            scores[lbl] = score
+            if score > best_score:
+                best, best_score = lbl, score
+    return best
+
+
+def _rw_positions(rw_by_node, n_funcs):
+    """Positions in sorted_addrs of the functions currently labeled RW."""
+    return [i for i in range(n_funcs) if rw_by_node[i] is not None]
+
+
+def _build_call_graph(functions, func_addrs, sorted_addrs):
+    """
+    Build the call graph in CSR form over dense node numbers.
+
+    func_addrs holds the already-parsed start of each function. Most call
+    targets are function starts, so their hex strings are resolved from
+    that table rather than parsed again per edge.
+
+    Nodes are sorted_addrs in order, followed by call targets that are
+    not function starts. Edges are deduplicated with sets while
+    building; each function's row keeps its set's iteration order, so
+    vote tie-breaks are unchanged. The rows are then packed into flat
+    int arrays: row i is indices[indptr[i]:indptr[i + 1]]. The
+    propagation passes only slice and size rows, and the packed form
+    holds 4 bytes per edge instead of a set or tuple per function.
+
+    Returns:
+        (node_addrs, node_index (addr -> node number),
+         (callee_indptr, callee_indices), (caller_indptr, caller_indices))
+    """
+    hex_to_addr = {f["start"]: a for f, a in zip(functions, func_addrs)}
+
+    callee_sets = defaultdict(set)
+    caller_sets = defaultdict(set)
+    for f, addr in zip(functions, func_addrs):
+        for target in f.get("calls_to", []):
+            t = hex_to_addr.get(target)
+            if t is None:
+                t = hex_to_addr[target] = int(target, 16)
+            callee_sets[addr].add(t)
+            caller_sets[t].add(addr)
+
+    node_addrs = list(sorted_addrs)
+    node_index = {a: i for i, a in enumerate(node_addrs)}
+    for a in caller_sets:
+        if a not in node_index:
+            node_index[a] = len(node_addrs)
+            node_addrs.append(a)
+
+    return (node_addrs, node_index,
+            _pack_rows(sorted_addrs, callee_sets, node_index),
+            _pack_rows(sorted_addrs, caller_sets, node_index))
+
+
+def _pack_rows(sorted_addrs, row_sets, node_index):
+    """Pack per-function address sets into (indptr, indices) int arrays."""
+    indptr = array("i", [0])
+    indices = array("i")
+    for a in sorted_addrs:
+        row = row_sets.get(a)
+        if row:
+            indices.extend([node_index[t] for t in row])
+        indptr.append(len(indices))
+    return indptr, indices
+
+
+def _rw_region_propagation(sorted_addrs, label_kind, rw_by_node, new_entries,
+                           callee_graph, caller_graph):
     """
     Within the RW code region, propagate RW labels aggressively.
 
@@ -182,50 +373,58 @@ def _rw_region_propagation(sorted_addrs, labels, propagated, callees, callers):
     aggressive than global propagation because the linker places RW
     object code contiguously.
 
-    Iterates until convergence.
+    Iterates until convergence. Each pass only revisits the region's
+    still-unlabeled functions, so the work shrinks as the region fills.
     """
     # Determine RW code region from current labels
-    rw_addrs = [a for a in sorted_addrs if a in labels and labels[a].startswith("rw_")]
-    if len(rw_addrs) < 10:
+    rw_positions = _rw_positions(rw_by_node, len(sorted_addrs))
+    if len(rw_positions) < 10:
         return 0
 
-    rw_code_lo = min(rw_addrs)
-    rw_code_hi = max(rw_addrs)
-
-    # Build set of addresses in the RW region
-    region_addrs = [a for a in sorted_addrs if rw_code_lo <= a <= rw_code_hi]
+    # Unlabeled positions in the RW region, in address order, each with
+    # its callers followed by its callees (the call graph is fixed, so
+    # the combined row is built once rather than per iteration)
+    callee_ptr, callee_idx = callee_graph
+    caller_ptr, caller_idx = caller_graph
+    pending = [(i, caller_idx[caller_ptr[i]:caller_ptr[i + 1]]
+                + callee_idx[callee_ptr[i]:callee_ptr[i + 1]])
+               for i in range(rw_positions[0], rw_positions[-1] + 1)
+               if not label_kind[i]]
+
+    # RW entries in each pending node's row, counted once up front and
+    # then bumped as neighbours are labeled, so an unconnected node is
+    # passed over without re-scanning its row. The neighbour relation is
+    # symmetric: i appears in t's row once for each time t is in i's.
+    rw_links = [0] * len(rw_by_node)
+    for i, neighbours in pending:
+        rw_links[i] = sum(1 for c in neighbours if rw_by_node[c] is not None)
 
     total_count = 0
     for iteration in range(20):
+        if not pending:
+            break
+
         count = 0
-        for addr in region_addrs:
-            if addr in labels:
+        still_pending = []
+        for node in pending:
+            i, neighbours = node
+
+            # Only functions with a connection to a known RW function
+            if not rw_links[i]:
+                still_pending.append(node)
                 continue
 
-            # Check if this function has any connection to a known RW function
-            connected_rw = False
-            rw_subcounts = defaultdict(int)
-
-            for c in callers.get(addr, set()):
-                if c in labels and labels[c].startswith("rw_"):
-                    connected_rw = True
-                    rw_subcounts[labels[c]] += 1
-            for c in callees.get(addr, set()):
-                if c in labels and labels[c].startswith("rw_"):
-                    connected_rw = True
-                    rw_subcounts[labels[c]] += 1
-
-            if connected_rw:
-                best = max(rw_subcounts, key=rw_subcounts.get) if rw_subcounts else "rw_core"
-                labels[addr] = best
-                propagated[addr] = {
-                    "category": best,
-                    "subcategory": None,
-                    "confidence": 0.70,
-                    "method": "rw_region_propagation",
-                }
-                count += 1
+            best = _vote_winner([rw_by_node[c] for c in neighbours],
+                                "rw_core")
+            label_kind[i] = _KIND_RW
+            rw_by_node[i] = best
+            new_entries.append((sorted_addrs[i], best, None,
+                                0.70, "rw_region_propagation"))
+            count += 1
+            for t in neighbours:
+                rw_links[t] += 1
 
+        pending = still_pending
         total_count += count
         if count == 0:
             break
@@ -233,7 +432,8 @@ def _rw_region_propagation(sorted_addrs, labels, propagated, callees, callers):
     return total_count
 
 
-def _proximity_propagation(sorted_addrs, labels, propagated):
+def _proximity_propagation(sorted_addrs, candidates, rw_code_lo, rw_code_hi,
+                           label_kind, rw_by_node, new_entries):
     """
     Propagate labels based on address proximity.
 
@@ -241,41 +441,39 @@ def _proximity_propagation(sorted_addrs, labels, propagated):
     Within the RW code region: single-sided propagation (if ONE adjacent
     neighbor is RW and the gap is small, propagate). This handles chains
     of unknowns within the contiguous RW code block.
-    """
-    rw_addrs = [a for a in sorted_addrs if a in labels and labels[a].startswith("rw_")]
-    rw_code_lo = min(rw_addrs) if rw_addrs else 0
-    rw_code_hi = max(rw_addrs) if rw_addrs else 0
 
-    count = 0
-    for i in range(1, len(sorted_addrs) - 1):
-        addr = sorted_addrs[i]
-        if addr in labels:
-            continue
+    Only the sorted_addrs positions in candidates (interior, unlabeled,
+    ascending) are examined, left to right, so a label set here is seen
+    by the next position in the same pass. A position's outcome depends
+    only on its two neighbours, so after this pass it can change only if
+    its right neighbour was labeled here (after it was examined).
 
+    Returns (new label count, positions to examine in the next pass).
+    """
+    labeled = []
+    for i in candidates:
+        addr = sorted_addrs[i]
         prev_addr = sorted_addrs[i - 1]
         next_addr = sorted_addrs[i + 1]
-        prev_lbl = labels.get(prev_addr)
-        next_lbl = labels.get(next_addr)
+        prev_rw = rw_by_node[i - 1]
+        next_rw = rw_by_node[i + 1]
 
         in_rw_region = rw_code_lo <= addr <= rw_code_hi
 
         if in_rw_region:
             # Within RW region: single-sided propagation with wider gap
             rw_neighbor = None
-            if prev_lbl and prev_lbl.startswith("rw_") and (addr - prev_addr) <= 0x2000:
-                rw_neighbor = prev_lbl
-            elif next_lbl and next_lbl.startswith("rw_") and (next_addr - addr) <= 0x2000:
-                rw_neighbor = next_lbl
+            if prev_rw is not None and (addr - prev_addr) <= 0x2000:
+                rw_neighbor = prev_rw
+            elif next_rw is not None and (next_addr - addr) <= 0x2000:
+                rw_neighbor = next_rw
 
             if rw_neighbor:
-                labels[addr] = rw_neighbor
-                propagated[addr] = {
-                    "category": rw_neighbor,
-                    "subcategory": None,
-                    "confidence": 0.60,
-                    "method": "cluster_proximity",
-                }
-                count += 1
+                label_kind[i] = _KIND_RW
+                rw_by_node[i] = rw_neighbor
+                new_entries.append((addr, rw_neighbor, None,
+                                    0.60, "cluster_proximity"))
+                labeled.append(i)
         else:
             # Outside RW region: require both neighbors
             if (addr - prev_addr) > config.PROXIMITY_GAP:
@@ -283,145 +481,146 @@ def _proximity_propagation(sorted_addrs, labels, propagated):
             if (next_addr - addr) > config.PROXIMITY_GAP:
                 continue
 
-            if prev_lbl and next_lbl:
-                if prev_lbl.startswith("rw_") and next_lbl.startswith("rw_"):
-                    labels[addr] = prev_lbl
-                    propagated[addr] = {
-                        "category": prev_lbl,
-                        "subcategory": None,
-                        "confidence": config.CONFIDENCE_CLUSTER_PROXIMITY,
-                        "method": "cluster_proximity",
-                    }
-                    count += 1
+            if prev_rw is not None and next_rw is not None:
+                label_kind[i] = _KIND_RW
+                rw_by_node[i] = prev_rw
+                new_entries.append((addr, prev_rw, None,
+                                    config.CONFIDENCE_CLUSTER_PROXIMITY,
+                                    "cluster_proximity"))
+                labeled.append(i)
 
-    return count
+    frontier = [i - 1 for i in labeled if i > 1 and not label_kind[i - 1]]
+    return len(labeled), frontier
 
 
-def _classify_rw_consumers(sorted_addrs, labels, propagated, callees):
+def _classify_unlabeled(sorted_addrs, node_addrs, label_kind, rw_by_node,
+                        new_entries, callee_graph, string_refs):
     """
-    Classify unlabeled functions that call RW functions as 'game_engine'.
-    These are the game's interface to the RenderWare engine (rendering,
-    world management, asset loading, etc.).
-    """
-    count = 0
-    # Get the RW code region bounds
-    rw_addrs = [a for a in sorted_addrs if a in labels and labels[a].startswith("rw_")]
-    if not rw_addrs:
-        return 0
-    rw_code_lo = min(rw_addrs)
+    Classify still-unlabeled functions with the final single-pass rules.
 
-    for addr in sorted_addrs:
-        if addr in labels:
-            continue
-        # Only classify functions BEFORE the RW region (game code calling RW)
-        if addr >= rw_code_lo:
-            continue
+    Each function takes the first rule that applies:
+      1. RW API consumer: before the RW code region and calls an RW
+         function → 'game_engine'. These are the game's interface to the
+         RenderWare engine (rendering, world management, asset loading).
+      2. XDK caller: calls into XDK library sections → the most-called
+         category (D3D → game_render, DSOUND/WMADEC → game_audio,
+         XMV → game_video, XONLINE/XNET → game_network, XPP → game_input).
+      3. Game sub-category from keywords in referenced strings.
 
-        callee_set = callees.get(addr, set())
-        rw_calls = sum(1 for c in callee_set
-                       if c in labels and labels[c].startswith("rw_"))
-        if rw_calls >= 1:
-            labels[addr] = "game_engine"
-            propagated[addr] = {
-                "category": "game_engine",
-                "subcategory": "engine",
-                "confidence": 0.65,
-                "method": "rw_consumer",
-            }
-            count += 1
+    No rule reads another function's non-RW label, so one sweep gives
+    the same labels as running each rule over every function in turn.
 
-    return count
+    Returns (consumer count, XDK caller count, game sub-category count).
+    """
+    consumer_count = xdk_count = game_count = 0
 
+    # Only functions BEFORE the RW region are consumers (game code
+    # calling RW)
+    rw_positions = _rw_positions(rw_by_node, len(sorted_addrs))
+    consumer_end = rw_positions[0] if rw_positions else 0
 
-def _classify_xdk_callers(sorted_addrs, labels, propagated, callees):
-    """
-    Classify unlabeled functions by which XDK library sections they call.
+    callee_ptr, callee_idx = callee_graph
+    best_by_text = {}
+    for i, addr in enumerate(sorted_addrs):
+        if label_kind[i]:
+            continue
 
-    Functions that call into D3D → game_render, DSOUND/WMADEC → game_audio,
-    XMV → game_video, XONLINE/XNET → game_network, XPP → game_input.
-    """
-    count = 0
-    xdk_sections = config.XDK_SECTIONS
+        row = callee_idx[callee_ptr[i]:callee_ptr[i + 1]]
+        if i < consumer_end:
+            for c in row:
+                if rw_by_node[c] is not None:
+                    label_kind[i] = _KIND_GAME
+                    new_entries.append((addr, "game_engine", "engine",
+                                        0.65, "rw_consumer"))
+                    consumer_count += 1
+                    break
+            if label_kind[i]:
+                continue
 
-    for addr in sorted_addrs:
-        if addr in labels:
+        best_cat = _xdk_category(row, node_addrs)
+        if best_cat is not None:
+            label_kind[i] = _KIND_GAME
+            new_entries.append((addr, best_cat, best_cat.replace("game_", ""),
+                                0.70, "xdk_caller"))
+            xdk_count += 1
             continue
 
-        callee_set = callees.get(addr, set())
-        if not callee_set:
+        # Functions referencing the same strings share one combined text,
+        # so the keyword scan runs once per distinct text
+        combined_text = string_refs.get(addr)
+        if not combined_text:
             continue
+        if combined_text in best_by_text:
+            best_cat = best_by_text[combined_text]
+        else:
+            best_cat = best_by_text[combined_text] = \
+                _best_game_category(combined_text)
+        if best_cat is not None:
+            label_kind[i] = _KIND_GAME
+            new_entries.append((addr, f"game_{best_cat}", best_cat,
+                                0.60, "string_keyword"))
+            game_count += 1
 
-        # Check which XDK sections this function calls
-        xdk_cats = {}
-        for target in callee_set:
-            for sec_name, (lo, hi, cat) in xdk_sections.items():
-                if lo <= target < hi:
-                    xdk_cats[cat] = xdk_cats.get(cat, 0) + 1
-
-        if xdk_cats:
-            # Pick the most-called XDK category
-            best_cat = max(xdk_cats, key=xdk_cats.get)
-            labels[addr] = best_cat
-            propagated[addr] = {
-                "category": best_cat,
-                "subcategory": best_cat.replace("game_", ""),
-                "confidence": 0.70,
-                "method": "xdk_caller",
-            }
-            count += 1
+    return consumer_count, xdk_count, game_count
 
-    return count
 
+def _xdk_category(row, node_addrs):
+    """
+    Most-called XDK library category among a row of call targets, or None.
 
-def _build_string_ref_map(imm_refs, strings):
-    """Build map of func_addr -> list of referenced string texts."""
-    str_by_addr = {}
-    for s in strings:
-        addr = int(s["address"], 16)
-        str_by_addr[addr] = s["string"].lower()
+    Ties go to the category first seen, like max() over the counts.
+    """
+    xdk_ranges = _XDK_RANGES
+    xdk_starts = _XDK_STARTS
 
-    func_strings = defaultdict(list)
-    for rdata_addr, func_addrs in imm_refs.items():
-        if rdata_addr in str_by_addr:
-            text = str_by_addr[rdata_addr]
-            for fa in func_addrs:
-                func_strings[fa].append(text)
+    xdk_cats = {}
+    for c in row:
+        target = node_addrs[c]
+        k = bisect_right(xdk_starts, target) - 1
+        if k >= 0:
+            lo, hi, cat = xdk_ranges[k]
+            if target < hi:
+                xdk_cats[cat] = xdk_cats.get(cat, 0) + 1
 
-    return func_strings
+    if not xdk_cats:
+        return None
+    return max(xdk_cats, key=xdk_cats.get)
 
 
-def _classify_game_subcategories(sorted_addrs, labels, propagated, string_refs):
+def _build_string_ref_map(imm_refs, strings):
     """
-    For unlabeled functions, try to sub-classify as game categories
-    based on referenced string content.
+    Build map of func_addr -> referenced string texts.
+
+    Each function's (lowercased) strings are joined once here into the
+    space-separated text the keyword matcher scans. Only strings that are
+    actually referenced are lowercased, each once however many functions
+    reference it.
     """
-    count = 0
-    for addr in sorted_addrs:
-        if addr in labels:
-            continue
+    str_by_addr = {int(s["address"], 16): s["string"] for s in strings}
 
-        refs = string_refs.get(addr, [])
-        if not refs:
+    func_strings = defaultdict(list)
+    for rdata_addr, func_addrs in imm_refs.items():
+        text = str_by_addr.get(rdata_addr)
+        if text is None:
             continue
+        text = text.lower()
+        for fa in func_addrs:
+            func_strings[fa].append(text)
 
-        best_cat = None
-        best_score = 0
-        combined_text = " ".join(refs)
+    return {fa: " ".join(texts) for fa, texts in func_strings.items()}
 
-        for cat, keywords in config.GAME_SUBCATEGORIES.items():
-            score = sum(1 for kw in keywords if kw in combined_text)
-            if score > best_score:
-                best_score = score
-                best_cat = cat
-
-        if best_cat and best_score >= 1:
-            labels[addr] = f"game_{best_cat}"
-            propagated[addr] = {
-                "category": f"game_{best_cat}",
-                "subcategory": best_cat,
-                "confidence": 0.60,
-                "method": "string_keyword",
-            }
-            count += 1
 
-    return count
+def _best_game_category(text):
+    """
+    Game sub-category with the most keywords found in text, or None.
+
+    Score = matching keywords per category; first category wins ties.
+    """
+    hits = [k for kw, k in _GAME_KEYWORD_TABLE if kw in text]
+    if not hits:
+        return None
+
+    scores = [0] * len(_GAME_CATEGORIES)
+    for k in hits:
+        scores[k] += 1
+    return _GAME_CATEGORIES[scores.index(max(scores))]
@@ -5,6 +5,8 @@ Defines section address ranges, CRT byte-level signatures, and
 confidence thresholds for each identification method.
 """
 
+from bisect import bisect_right
+
 # ============================================================
 # Section Address Ranges (from XBE analysis)
 # ============================================================
@@ -53,14 +55,44 @@ SECTIONS = [
 ]
 
 
+# Section bounds sorted by VA for bisect lookup (the sections are disjoint)
+_SECTION_BOUNDS = sorted(
+    (sec_va, sec_va + sec_size, sec_raw)
+    for name, sec_va, sec_size, sec_raw in SECTIONS
+)
+_SECTION_STARTS = [sec_va for sec_va, _, _ in _SECTION_BOUNDS]
+
+
 def va_to_file_offset(va):
     """Convert a virtual address to a file offset in the XBE."""
-    for name, sec_va, sec_size, sec_raw in SECTIONS:
-        if sec_va <= va < sec_va + sec_size:
+    k = bisect_right(_SECTION_STARTS, va) - 1
+    if k >= 0:
+        sec_va, sec_end, sec_raw = _SECTION_BOUNDS[k]
+        if va < sec_end:
             return va - sec_va + sec_raw
     return None
 
 
+def va_to_file_offsets(vas):
+    """
+    Convert many virtual addresses to XBE file offsets (None if unmapped).
+
+    Consecutive addresses usually fall in the same section, so the last
+    section found is tried before bisecting again.
+    """
+    offsets = []
+    sec_va = sec_end = sec_raw = 0
+    for va in vas:
+        if not sec_va <= va < sec_end:
+            k = bisect_right(_SECTION_STARTS, va) - 1
+            if k < 0 or va >= _SECTION_BOUNDS[k][1]:
+                offsets.append(None)
+                continue
+            sec_va, sec_end, sec_raw = _SECTION_BOUNDS[k]
+        offsets.append(va - sec_va + sec_raw)
+    return offsets
+
+
 # ============================================================
 # XDK Library Section Ranges (statically linked Xbox SDK libs)
 # ============================================================
@@ -227,8 +259,23 @@ CONFIDENCE_CLUSTER_PROXIMITY = 0.65  # Label propagation via address proximity
 # Maximum address gap for proximity clustering
 PROXIMITY_GAP = 0x1000
 
-# Maximum clustering iterations
-MAX_CLUSTER_ITERATIONS = 10
+# Clustering iterations: majority voting runs until an iteration adds no
+# labels, or two consecutive iterations each add fewer than
+# max(CLUSTER_SETTLE_MIN_LABELS, CLUSTER_SETTLE_FRACTION * #functions),
+# with MAX_CLUSTER_ITERATIONS as a hard cap
+MAX_CLUSTER_ITERATIONS = 200
+CLUSTER_SETTLE_MIN_LABELS = 5
+CLUSTER_SETTLE_FRACTION = 0.001
+
+# Seed for visiting majority-vote candidates in a shuffled order each
+# iteration (asynchronous label propagation), which can converge in
+# fewer iterations. None keeps address order; any change of order can
+# change which RW sub-category wins close votes.
+CLUSTER_SHUFFLE_SEED = None
+
+# Non-verbose runs with at least this many functions run CRT identification
+# (Phase 3) in a forked worker alongside RW identification (Phase 2)
+PHASE_PARALLEL_MIN_FUNCTIONS = 5000
 
 # ============================================================
 # RenderWare Module Categories
@@ -279,3 +326,7 @@ DEFAULT_FUNCTIONS_JSON = "tools/disasm/output/functions.json"
 DEFAULT_STRINGS_JSON = "tools/disasm/output/strings.json"
 DEFAULT_XREFS_JSON = "tools/disasm/output/xrefs.json"
 DEFAULT_OUTPUT_DIR = "tools/func_id/output"
+
+# Subdirectory of the output directory holding pickled copies of the
+# parsed JSON inputs, reused across runs (see --cache)
+JSON_CACHE_DIRNAME = ".json_cache"
@@ -8,13 +8,97 @@ for common MSVC CRT functions (memcpy, strlen, _ftol, _chkstk, etc.).
 from . import config
 
 
-def identify_crt_functions(xbe_data, functions, verbose=False):
+def _build_signature_trie(signatures):
+    """
+    Compile the unmasked signatures into a byte trie anchored at offset 0.
+
+    Each node is a dict of next byte -> child node; a node where one or
+    more patterns end also maps None -> [signature index, ...]. Masked
+    signatures can't be walked byte-for-byte, so their indices are
+    returned separately for the per-pattern fallback, bucketed by first
+    byte (None when the first byte is not fully specified).
+    """
+    trie = {}
+    masked = {}
+    for idx, (sig_name, pattern, mask, max_size) in enumerate(signatures):
+        if mask is not None:
+            first = pattern[0] if mask[0] == 0xFF else None
+            masked.setdefault(first, []).append(idx)
+            continue
+        node = trie
+        for b in pattern:
+            node = node.setdefault(b, {})
+        node.setdefault(None, []).append(idx)
+    return trie, masked
+
+
+_SIGNATURE_TRIE, _MASKED_BY_FIRST_BYTE = _build_signature_trie(
+    config.CRT_SIGNATURES)
+_MASKED_ANY_FIRST_BYTE = _MASKED_BY_FIRST_BYTE.pop(None, [])
+
+# First bytes any signature can start with; most function heads fail
+# this single set test. None if some signature has a wildcard first byte.
+_SIGNATURE_FIRST_BYTES = None if _MASKED_ANY_FIRST_BYTE else frozenset(
+    set(_SIGNATURE_TRIE) | set(_MASKED_BY_FIRST_BYTE))
+
+# Every signature's fully-specified leading bytes (the whole pattern when
+# unmasked). A head starting with none of these can't match anything,
+# and bytes.startswith tests the whole tuple in one C-level call.
+_SIGNATURE_PREFIXES = tuple(
+    pattern if mask is None
+    else pattern[:next((k for k, m in enumerate(mask) if m != 0xFF),
+                       len(mask))]
+    for _, pattern, mask, _ in config.CRT_SIGNATURES
+)
+
+# Longest signature; the match result depends only on this many bytes
+_SIGNATURE_SPAN = max(len(pattern) for _, pattern, _, _ in config.CRT_SIGNATURES)
+
+
+def _matching_signatures(func_bytes):
+    """
+    Indices of every signature matching func_bytes, in signature order.
+
+    One walk down the trie finds all unmasked patterns that prefix
+    func_bytes; only the masked signatures sharing its first byte (or
+    with a wildcard first byte) are tested one at a time.
+    """
+    if _SIGNATURE_FIRST_BYTES is not None and \
+            func_bytes[0] not in _SIGNATURE_FIRST_BYTES:
+        return []
+    if not func_bytes.startswith(_SIGNATURE_PREFIXES):
+        return []
+
+    hits = []
+    node = _SIGNATURE_TRIE
+    for b in func_bytes:
+        node = node.get(b)
+        if node is None:
+            break
+        if None in node:
+            hits.extend(node[None])
+    for idx in _MASKED_BY_FIRST_BYTE.get(func_bytes[0], ()):
+        _, pattern, mask, _ = config.CRT_SIGNATURES[idx]
+        if len(func_bytes) >= len(pattern) and \
+                _match_pattern(func_bytes, pattern, mask):
+            hits.append(idx)
+    for idx in _MASKED_ANY_FIRST_BYTE:
+        _, pattern, mask, _ = config.CRT_SIGNATURES[idx]
+        if len(func_bytes) >= len(pattern) and \
+                _match_pattern(func_bytes, pattern, mask):
+            hits.append(idx)
+    hits.sort()
+    return hits
+
+
+def identify_crt_functions(xbe_data, functions, func_addrs, verbose=False):
     """
     Identify CRT functions by matching byte signatures.
 
     Args:
         xbe_data: Raw bytes of the entire XBE file.
         functions: List of function dicts.
+        func_addrs: Start address (int) of each function in functions.
         verbose: Print progress info.
 
     Returns:
@@ -26,6 +110,9 @@ def identify_crt_functions(xbe_data, functions, verbose=False):
         }
     """
     results = {}
+    # Signature hits per distinct function head. Compiler prologues repeat
+    # across many functions, so each distinct head is matched only once.
+    head_hits = {}
     # Track which signature names have been matched to avoid duplicates
     # (e.g., _chkstk and _alloca_probe share the same bytes)
     matched_names = {}
@@ -33,54 +120,57 @@ def identify_crt_functions(xbe_data, functions, verbose=False):
     if verbose:
         print(f"  Matching {len(config.CRT_SIGNATURES)} CRT signatures against {len(functions)} functions...")
 
-    for func in functions:
-        func_addr = int(func["start"], 16)
+    file_offsets = config.va_to_file_offsets(func_addrs)
+
+    for func, func_addr, file_offset in zip(functions, func_addrs,
+                                            file_offsets):
         func_size = func.get("size", 0)
 
-        # Read first 32 bytes of the function from XBE
-        file_offset = config.va_to_file_offset(func_addr)
+        # Read the function head from XBE
         if file_offset is None:
             continue
 
         # Read enough bytes for signature matching
-        read_len = min(32, len(xbe_data) - file_offset)
+        read_len = min(_SIGNATURE_SPAN, len(xbe_data) - file_offset)
         if read_len < 2:
             continue
         func_bytes = xbe_data[file_offset:file_offset + read_len]
 
-        # Try each signature
-        for sig_name, pattern, mask, max_size in config.CRT_SIGNATURES:
-            if len(func_bytes) < len(pattern):
-                continue
+        hits = head_hits.get(func_bytes)
+        if hits is None:
+            hits = head_hits[func_bytes] = _matching_signatures(func_bytes)
+
+        # Try each signature whose pattern prefixes the function
+        for idx in hits:
+            sig_name, pattern, mask, max_size = config.CRT_SIGNATURES[idx]
 
             # Size check: if max_size > 0, function shouldn't be too large
             if max_size > 0 and func_size > max_size * 2:
                 continue
 
-            if _match_pattern(func_bytes, pattern, mask):
-                # Prefer longer pattern matches (more specific)
-                if func_addr in results:
-                    if len(pattern) <= results[func_addr]["pattern_len"]:
-                        continue
-
-                # If this name is already matched to a different address,
-                # keep the one with smaller function size (more likely correct)
-                if sig_name in matched_names:
-                    prev_addr = matched_names[sig_name]
-                    prev_size = results[prev_addr].get("func_size", 0)
-                    if func_size > 0 and prev_size > 0 and func_size >= prev_size:
-                        continue
-                    # New match is better, remove old one
-                    del results[prev_addr]
-
-                results[func_addr] = {
-                    "name": sig_name,
-                    "confidence": config.CONFIDENCE_CRT_SIGNATURE,
-                    "method": "crt_signature",
-                    "pattern_len": len(pattern),
-                    "func_size": func_size,
-                }
-                matched_names[sig_name] = func_addr
+            # Prefer longer pattern matches (more specific)
+            if func_addr in results:
+                if len(pattern) <= results[func_addr]["pattern_len"]:
+                    continue
+
+            # If this name is already matched to a different address,
+            # keep the one with smaller function size (more likely correct)
+            if sig_name in matched_names:
+                prev_addr = matched_names[sig_name]
+                prev_size = results[prev_addr].get("func_size", 0)
+                if func_size > 0 and prev_size > 0 and func_size >= prev_size:
+                    continue
+                # New match is better, remove old one
+                del results[prev_addr]
+
+            results[func_addr] = {
+                "name": sig_name,
+                "confidence": config.CONFIDENCE_CRT_SIGNATURE,
+                "method": "crt_signature",
+                "pattern_len": len(pattern),
+                "func_size": func_size,
+            }
+            matched_names[sig_name] = func_addr
 
     # Clean up internal fields
     for r in results.values():
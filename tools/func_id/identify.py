@@ -5,11 +5,19 @@ Loads all input data, runs identification phases in order,
 and produces enriched output.
 """
 
-import json
+import hashlib
+import mmap
+import multiprocessing
 import os
+import pickle
+import sys
+import tempfile
 import time
+from bisect import bisect_right
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
+from ..jsonio import load_json_file
 from . import config
 from .imm_scanner import scan_immediate_refs
 from .rw_identifier import identify_rw_functions
@@ -21,7 +29,7 @@ from .output import write_results
 
 
 def run(xbe_path, functions_path=None, strings_path=None, xrefs_path=None,
-        output_dir=None, verbose=False):
+        output_dir=None, verbose=False, use_cache=False):
     """
     Run the full function identification pipeline.
 
@@ -32,6 +40,9 @@ def run(xbe_path, functions_path=None, strings_path=None, xrefs_path=None,
         xrefs_path: Path to xrefs.json (or default).
         output_dir: Output directory (or default).
         verbose: Print progress info.
+        use_cache: Keep pickled copies of the JSON inputs in the output
+            directory and reuse them on later runs while the files are
+            unchanged.
 
     Returns:
         dict: Summary statistics.
@@ -47,10 +58,27 @@ def run(xbe_path, functions_path=None, strings_path=None, xrefs_path=None,
     if verbose:
         print("Phase 0: Loading inputs...")
 
-    xbe_data = _load_binary(xbe_path)
-    functions = _load_json(functions_path)
-    strings = _load_json(strings_path)
-    xrefs = _load_json(xrefs_path)
+    # The four loads are independent, so their file reads (which release
+    # the GIL) overlap with each other and with parsing on a thread pool
+    json_paths = (functions_path, strings_path, xrefs_path)
+    cache_dir = (os.path.join(output_dir, config.JSON_CACHE_DIRNAME)
+                 if use_cache else None)
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        xbe_future = ex.submit(_load_binary, xbe_path)
+        json_futures = [ex.submit(_load_json, path, cache_dir)
+                        for path in json_paths]
+        xbe_data = xbe_future.result()
+        functions, strings, xrefs = (fut.result() for fut in json_futures)
+
+    # The cache only ever holds the current inputs' entries
+    if cache_dir is not None:
+        _prune_json_cache(cache_dir, {_json_cache_path(path, cache_dir)
+                                      for path in json_paths})
+
+    # Function starts parsed once for the phases that walk every function,
+    # and sorted once for the phases that search them
+    func_addrs = [int(f["start"], 16) for f in functions]
+    func_starts = sorted(func_addrs)
 
     if verbose:
         print(f"  XBE: {len(xbe_data):,} bytes")
@@ -62,58 +90,71 @@ def run(xbe_path, functions_path=None, strings_path=None, xrefs_path=None,
     if verbose:
         print("\nPhase 1: Scanning immediate operands + merging xrefs...")
     t1 = time.time()
-    imm_refs = scan_immediate_refs(xbe_data, functions, verbose=verbose)
+    imm_refs = scan_immediate_refs(xbe_data, functions, verbose=verbose,
+                                   func_starts=func_starts)
 
     # Merge data_read xrefs that target .rdata/.data into imm_refs
-    xref_merge_count = _merge_xref_data_reads(xrefs, functions, imm_refs, verbose)
+    xref_merge_count = _merge_xref_data_reads(xrefs, func_starts, imm_refs,
+                                              verbose)
 
     if verbose:
         print(f"  Merged {xref_merge_count:,} data_read xrefs")
         print(f"  Total unique data addresses after merge: {len(imm_refs):,}")
         print(f"  Done in {time.time() - t1:.1f}s")
 
-    # ── Phase 2: RenderWare identification ────────────────────
-    if verbose:
-        print("\nPhase 2: RenderWare identification...")
-    t2 = time.time()
-    rw_results, rw_modules = identify_rw_functions(
-        strings, imm_refs, functions, verbose=verbose
-    )
-    if verbose:
-        print(f"  Done in {time.time() - t2:.1f}s")
-
-    # ── Phase 3: CRT identification ──────────────────────────
-    if verbose:
-        print("\nPhase 3: CRT identification...")
-    t3 = time.time()
-    crt_results = identify_crt_functions(xbe_data, functions, verbose=verbose)
-    if verbose:
-        print(f"  Done in {time.time() - t3:.1f}s")
+    # Phases 2 and 3 are independent (RW reads strings + imm_refs, CRT reads
+    # the image), so large runs fork CRT off to a second core while RW runs
+    # here. Verbose runs stay serial to keep each phase's log and timing.
+    if (not verbose and
+            len(functions) >= config.PHASE_PARALLEL_MIN_FUNCTIONS and
+            (os.cpu_count() or 1) > 1 and
+            sys.platform.startswith("linux")):
+        rw_results, rw_modules, crt_results = _identify_rw_and_crt_parallel(
+            strings, imm_refs, functions, xbe_data, func_addrs)
+    else:
+        # ── Phase 2: RenderWare identification ────────────────
+        if verbose:
+            print("\nPhase 2: RenderWare identification...")
+        t2 = time.time()
+        rw_results, rw_modules = identify_rw_functions(
+            strings, imm_refs, functions, verbose=verbose
+        )
+        if verbose:
+            print(f"  Done in {time.time() - t2:.1f}s")
+
+        # ── Phase 3: CRT identification ──────────────────────
+        if verbose:
+            print("\nPhase 3: CRT identification...")
+        t3 = time.time()
+        crt_results = identify_crt_functions(
+            xbe_data, functions, func_addrs, verbose=verbose
+        )
+        if verbose:
+            print(f"  Done in {time.time() - t3:.1f}s")
 
     # Remove any CRT matches that overlap with RW (RW wins)
-    for addr in list(crt_results.keys()):
-        if addr in rw_results:
-            del crt_results[addr]
+    crt_results = {addr: info for addr, info in crt_results.items()
+                   if addr not in rw_results}
 
     # ── Phase 3b: Stub classification ────────────────────────
     if verbose:
         print("\nPhase 3b: Stub classification...")
     t3b = time.time()
-    stub_results = classify_stubs(xbe_data, functions, verbose=verbose)
+    stub_results = classify_stubs(xbe_data, functions, func_addrs,
+                                  verbose=verbose)
     if verbose:
         print(f"  Done in {time.time() - t3b:.1f}s")
 
     # Remove stubs that overlap with RW or CRT
-    for addr in list(stub_results.keys()):
-        if addr in rw_results or addr in crt_results:
-            del stub_results[addr]
+    stub_results = {addr: info for addr, info in stub_results.items()
+                    if addr not in rw_results and addr not in crt_results}
 
     # ── Phase 4: Label propagation ───────────────────────────
     if verbose:
         print("\nPhase 4: Label propagation...")
     t4 = time.time()
     propagated = propagate_labels(
-        functions, rw_results, crt_results, imm_refs, strings,
+        functions, func_addrs, rw_results, crt_results, imm_refs, strings,
         verbose=verbose
     )
     if verbose:
@@ -124,7 +165,7 @@ def run(xbe_path, functions_path=None, strings_path=None, xrefs_path=None,
         print("\nPhase 5: Vtable scanning...")
     t5 = time.time()
     vtable_results, vtables = scan_vtables(
-        xbe_data, functions, imm_refs, verbose=verbose
+        xbe_data, functions, func_addrs, imm_refs, verbose=verbose
     )
     # Only classify functions not already labeled by earlier phases
     already_labeled = set(rw_results) | set(crt_results) | set(propagated) | set(stub_results)
@@ -141,8 +182,8 @@ def run(xbe_path, functions_path=None, strings_path=None, xrefs_path=None,
         print("\nPhase 6: Writing output...")
 
     summary = write_results(
-        functions, rw_results, crt_results, propagated, rw_modules,
-        output_dir, verbose=verbose, stub_results=stub_results
+        functions, func_addrs, rw_results, crt_results, propagated,
+        rw_modules, output_dir, verbose=verbose, stub_results=stub_results
     )
 
     if verbose:
@@ -152,66 +193,179 @@ def run(xbe_path, functions_path=None, strings_path=None, xrefs_path=None,
     return summary
 
 
-def _merge_xref_data_reads(xrefs, functions, imm_refs, verbose):
+# Phase 3 inputs handed to the forked CRT worker (inherited, not pickled)
+_fork_state = None
+
+
+def _identify_crt_worker():
+    """Run Phase 3 in a forked worker on the inherited _fork_state."""
+    xbe_data, functions, func_addrs = _fork_state
+    return identify_crt_functions(xbe_data, functions, func_addrs)
+
+
+def _identify_rw_and_crt_parallel(strings, imm_refs, functions, xbe_data,
+                                  func_addrs):
+    """
+    Run Phase 2 in this process while Phase 3 runs in a forked worker.
+
+    The worker inherits the image and function list through fork, so only
+    the CRT results travel back. Returns (rw_results, rw_modules,
+    crt_results), the same as running the two phases serially.
+    """
+    global _fork_state
+
+    _fork_state = (xbe_data, functions, func_addrs)
+    try:
+        with ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("fork")) as ex:
+            crt_future = ex.submit(_identify_crt_worker)
+            rw_results, rw_modules = identify_rw_functions(
+                strings, imm_refs, functions)
+            crt_results = crt_future.result()
+    finally:
+        _fork_state = None
+
+    return rw_results, rw_modules, crt_results
+
+
+def _merge_xref_data_reads(xrefs, func_starts, imm_refs, verbose):
     """
     Merge data_read xrefs into the imm_refs map.
 
     The xref database has 77K+ data_read entries (from mov [addr] style
     instructions) that the imm_scanner misses. Merging these gives a
-    much more complete picture of data references.
+    much more complete picture of data references. func_starts is the
+    sorted list of function start addresses.
 
     Returns the count of new entries added.
     """
-    # Build sorted function start list for binary search
-    func_starts = sorted(int(f["start"], 16) for f in functions)
-
     rdata_lo = config.RDATA_VA_START
     rdata_hi = config.RDATA_VA_END
     data_lo = config.DATA_VA_START
     data_hi = config.DATA_VA_END
 
+    # Xrefs from one function tend to be listed together, so the address
+    # range of the last containing function is checked before bisecting
+    n_starts = len(func_starts)
+    range_lo, range_hi, func_addr = 0, 0, None
+
+    # Membership sets for the lists touched so far, so a repeat function
+    # is rejected without scanning the list; the lists keep their order
+    members = {}
+
+    # Filter in bulk: comprehensions pick out the data_read xrefs, then
+    # those whose target lands in .rdata/.data, before any per-xref work
+    data_reads = [(int(xref["to"], 16), xref["from"]) for xref in xrefs
+                  if xref["type"] == "data_read"]
+    data_reads = [(target, source) for target, source in data_reads
+                  if rdata_lo <= target < rdata_hi or data_lo <= target < data_hi]
+
     count = 0
-    for xref in xrefs:
-        if xref["type"] != "data_read":
-            continue
-
-        target = int(xref["to"], 16)
-        if not ((rdata_lo <= target < rdata_hi) or (data_lo <= target < data_hi)):
-            continue
-
-        source = int(xref["from"], 16)
-
-        # Find containing function
-        lo, hi = 0, len(func_starts) - 1
-        while lo <= hi:
-            mid = (lo + hi) // 2
-            if func_starts[mid] <= source:
-                lo = mid + 1
-            else:
-                hi = mid - 1
-        func_addr = func_starts[hi] if hi >= 0 else None
+    for target, source in data_reads:
+        source = int(source, 16)
+
+        # Find containing function (last func_start <= source)
+        if not (range_lo <= source < range_hi):
+            pos = bisect_right(func_starts, source)
+            func_addr = func_starts[pos - 1] if pos else None
+            range_lo = func_addr if pos else -1
+            range_hi = func_starts[pos] if pos < n_starts else 1 << 32
 
         if func_addr is not None:
-            if target not in imm_refs:
-                imm_refs[target] = []
-                count += 1
-            if func_addr not in imm_refs[target]:
+            seen = members.get(target)
+            if seen is None:
+                funcs = imm_refs.get(target)
+                if funcs is None:
+                    imm_refs[target] = []
+                    count += 1
+                seen = members[target] = set(funcs or ())
+            if func_addr not in seen:
+                seen.add(func_addr)
                 imm_refs[target].append(func_addr)
 
     return count
 
 
 def _load_binary(path):
-    """Load a binary file."""
+    """
+    Load a binary file as a read-only memory map.
+
+    The phases only take len() and slices of the image, which a mmap
+    serves like bytes while the OS pages in just the parts touched.
+    Falls back to reading the file when it can't be mapped (e.g. empty).
+    """
     if not os.path.exists(path):
         raise FileNotFoundError(f"XBE file not found: {path}")
     with open(path, "rb") as f:
-        return f.read()
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return f.read()
+
 
+def _load_json(path, cache_dir=None):
+    """
+    Load a JSON file.
 
-def _load_json(path):
-    """Load a JSON file."""
+    With a cache_dir, the parsed data is also pickled there under a name
+    built from the file's path, mtime and size, and later runs on the
+    unchanged file load the pickle instead of re-parsing the JSON.
+    """
     if not os.path.exists(path):
         raise FileNotFoundError(f"JSON file not found: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    if cache_dir is None:
+        return load_json_file(path)
+
+    cache_path = _json_cache_path(path, cache_dir)
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass
+
+    data = load_json_file(path)
+
+    # Written to a unique temp file and renamed into place, so concurrent
+    # runs never see (or clobber) a half-written entry
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except OSError:
+        pass  # Cache is best-effort
+
+    return data
+
+
+def _json_cache_path(path, cache_dir):
+    """Cache entry for a JSON file: hashed path plus its mtime and size."""
+    st = os.stat(path)
+    name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{name}-{st.st_mtime_ns}-{st.st_size}.pickle")
+
+
+def _prune_json_cache(cache_dir, keep):
+    """
+    Delete cached pickles other than the entries in keep.
+
+    Entries for inputs that have since changed or moved no longer match
+    any current file, so without this the cache would grow on every edit.
+    """
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        entry = os.path.join(cache_dir, name)
+        if name.endswith(".pickle") and entry not in keep:
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
@@ -7,13 +7,47 @@ This captures string/data references that the xref database misses
 because it only tracked CS_OP_MEM operands, not CS_OP_IMM.
 """
 
+import mmap
+import re
 import struct
+from bisect import bisect_right
 from collections import defaultdict
 
 from . import config
 
+_IMM32 = struct.Struct("<I")
 
-def scan_immediate_refs(xbe_data, functions, verbose=False):
+
+def _build_imm32_pattern():
+    """
+    Regex for push imm32 (0x68) and mov reg, imm32 (0xB8-0xBF: eax/ecx/
+    edx/ebx/esp/ebp/esi/edi), each followed by a 4-byte LE immediate.
+
+    Group 1 only matches when the immediate's upper 16 bits fall inside
+    .rdata or .data, so most candidates are rejected by the regex engine
+    and never reach the exact range check. Either branch consumes the
+    full instruction.
+    """
+    words = set()
+    for lo, hi in ((config.RDATA_VA_START, config.RDATA_VA_END),
+                   (config.DATA_VA_START, config.DATA_VA_END)):
+        words.update(range(lo >> 16, ((hi - 1) >> 16) + 1))
+
+    low_by_high = defaultdict(list)
+    for word in sorted(words):
+        low_by_high[word >> 8].append(word & 0xFF)
+
+    alts = b"|".join(
+        b"[" + b"".join(b"\\x%02X" % lo for lo in lows) + b"]\\x%02X" % hi
+        for hi, lows in low_by_high.items())
+    return re.compile(rb"[\x68\xB8-\xBF](?:(..(?:" + alts + rb"))|.{4})",
+                      re.DOTALL)
+
+
+_IMM32_INSN = _build_imm32_pattern()
+
+
+def scan_immediate_refs(xbe_data, functions, verbose=False, func_starts=None):
     """
     Single-pass scan of the .text section bytes for immediate operands
     referencing .rdata addresses.
@@ -22,6 +56,8 @@ def scan_immediate_refs(xbe_data, functions, verbose=False):
         xbe_data: Raw bytes of the entire XBE file.
         functions: List of function dicts (with 'start' hex string keys).
         verbose: Print progress info.
+        func_starts: Sorted function start addresses (built from
+            functions if not given).
 
     Returns:
         dict: rdata_addr (int) -> list of func_start_addr (int)
@@ -29,12 +65,16 @@ def scan_immediate_refs(xbe_data, functions, verbose=False):
               to the function(s) containing that reference.
     """
     # Build sorted function start list for binary search lookup
-    func_starts = sorted(int(f["start"], 16) for f in functions)
+    if func_starts is None:
+        func_starts = sorted(int(f["start"], 16) for f in functions)
 
     # Section boundaries
     text_file_start = config.TEXT_RAW_ADDR
     text_file_end = text_file_start + config.TEXT_VA_SIZE
-    text_bytes = xbe_data[text_file_start:text_file_end]
+    # A memoryview slice reads .text in place rather than copying it out of
+    # the (usually memory-mapped) image
+    text_bytes = memoryview(xbe_data)[text_file_start:text_file_end]
+    _advise_sequential(xbe_data, text_file_start, len(text_bytes))
     text_va_base = config.TEXT_VA_START
 
     rdata_lo = config.RDATA_VA_START
@@ -46,83 +86,68 @@ def scan_immediate_refs(xbe_data, functions, verbose=False):
         print(f"  Scanning {len(text_bytes):,} bytes of .text section...")
         print(f"  .rdata range: 0x{rdata_lo:08X} - 0x{rdata_hi:08X}")
 
-    # Results: rdata_addr -> set of code addresses that reference it
-    refs_by_rdata_addr = defaultdict(set)
+    # Results: rdata_addr -> ascending list of containing function starts
+    # (empty while only referenced from outside any known function)
+    refs_by_rdata_addr = {}
     total_refs = 0
 
-    # Single-pass scan
-    i = 0
-    end = len(text_bytes) - 5  # Need at least opcode + 4 bytes
-
-    while i < end:
-        b = text_bytes[i]
-        imm_val = None
-
-        # push imm32: opcode 0x68, followed by 4-byte LE immediate
-        if b == 0x68:
-            imm_val = struct.unpack_from("<I", text_bytes, i + 1)[0]
-            if _in_data_range(imm_val, rdata_lo, rdata_hi, data_lo, data_hi):
-                code_va = text_va_base + i
-                refs_by_rdata_addr[imm_val].add(code_va)
-                total_refs += 1
-            i += 5
-            continue
-
-        # mov reg, imm32: opcodes 0xB8-0xBF (mov eax/ecx/edx/ebx/esp/ebp/esi/edi, imm32)
-        if 0xB8 <= b <= 0xBF:
-            imm_val = struct.unpack_from("<I", text_bytes, i + 1)[0]
-            if _in_data_range(imm_val, rdata_lo, rdata_hi, data_lo, data_hi):
-                code_va = text_va_base + i
-                refs_by_rdata_addr[imm_val].add(code_va)
-                total_refs += 1
-            i += 5
+    # Matches come out in ascending address order, so each containing
+    # function is found by a bisect that starts from the previous one
+    # rather than searching the whole start list again, and every list
+    # above grows in ascending order: a repeat reference from the same
+    # function can only be the list's last entry, so plain lists replace
+    # per-address sets and need no sorting afterwards.
+    func_pos = 0
+
+    # Single-pass scan. The regex engine walks the bytes in C and, like a
+    # byte-at-a-time loop that skips past each decoded instruction, only
+    # resumes after a match, so overlapping candidates are treated the same.
+    # Stopping one byte short keeps the old "opcode + 4 bytes + 1" bound.
+    unpack_imm = _IMM32.unpack_from
+    for m in _IMM32_INSN.finditer(text_bytes, 0, len(text_bytes) - 1):
+        if m.lastindex is None:
             continue
-
-        # mov r/m32, imm32 with Mod R/M: opcode 0xC7 /0
-        # e.g., mov [ebp-XX], imm32 or mov dword ptr [addr], imm32
-        # We only care about the imm32 part, but the instruction length varies
-        # Skip this for now - push/mov-reg cover most string refs
-
-        i += 1
+        i = m.start()
+        imm_val = unpack_imm(text_bytes, i + 1)[0]
+        if rdata_lo <= imm_val < rdata_hi or data_lo <= imm_val < data_hi:
+            code_va = text_va_base + i
+            func_pos = bisect_right(func_starts, code_va, func_pos)
+            funcs = refs_by_rdata_addr.get(imm_val)
+            if funcs is None:
+                refs_by_rdata_addr[imm_val] = funcs = []
+            if func_pos:
+                func_addr = func_starts[func_pos - 1]
+                if not funcs or funcs[-1] != func_addr:
+                    funcs.append(func_addr)
+            total_refs += 1
+
+    # mov r/m32, imm32 with Mod R/M: opcode 0xC7 /0
+    # e.g., mov [ebp-XX], imm32 or mov dword ptr [addr], imm32
+    # We only care about the imm32 part, but the instruction length varies
+    # Skip this for now - push/mov-reg cover most string refs
 
     if verbose:
         print(f"  Found {total_refs:,} immediate references to .rdata/.data")
         print(f"  Unique .rdata/.data addresses referenced: {len(refs_by_rdata_addr):,}")
 
-    # Map code addresses to their containing functions
-    rdata_to_funcs = defaultdict(set)
-    for rdata_addr, code_addrs in refs_by_rdata_addr.items():
-        for code_addr in code_addrs:
-            func_addr = _find_containing_function(code_addr, func_starts)
-            if func_addr is not None:
-                rdata_to_funcs[rdata_addr].add(func_addr)
+    # Drop addresses only referenced outside any function
+    rdata_to_funcs = {addr: funcs for addr, funcs in refs_by_rdata_addr.items()
+                      if funcs}
 
     if verbose:
         n_funcs = len(set().union(*rdata_to_funcs.values())) if rdata_to_funcs else 0
         print(f"  Mapped to {n_funcs:,} unique functions")
 
-    # Convert sets to sorted lists for JSON serialization
-    return {addr: sorted(funcs) for addr, funcs in rdata_to_funcs.items()}
+    return rdata_to_funcs
 
 
-def _in_data_range(val, rdata_lo, rdata_hi, data_lo, data_hi):
-    """Check if an immediate value falls in .rdata or .data VA range."""
-    return (rdata_lo <= val < rdata_hi) or (data_lo <= val < data_hi)
-
-
-def _find_containing_function(code_addr, sorted_func_starts):
-    """
-    Binary search to find which function contains code_addr.
-    Returns the function start address, or None if not found.
-    """
-    lo, hi = 0, len(sorted_func_starts) - 1
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        if sorted_func_starts[mid] <= code_addr:
-            lo = mid + 1
-        else:
-            hi = mid - 1
-    # hi now points to the last func_start <= code_addr
-    if hi >= 0:
-        return sorted_func_starts[hi]
-    return None
+def _advise_sequential(xbe_data, start, length):
+    """Tell the kernel a memory-mapped range is about to be read in order."""
+    if not hasattr(xbe_data, "madvise") or not hasattr(mmap, "MADV_SEQUENTIAL"):
+        return
+    page_start = start - start % mmap.PAGESIZE
+    try:
+        xbe_data.madvise(mmap.MADV_SEQUENTIAL, page_start,
+                         start + length - page_start)
+    except (OSError, ValueError):
+        pass  # Only a hint
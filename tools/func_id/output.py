@@ -4,18 +4,20 @@ Output writers for function identification results.
 Produces JSON files and a human-readable summary.
 """
 
-import json
 import os
 from collections import Counter
 
+from ..jsonio import encode_json
 
-def write_results(functions, rw_results, crt_results, propagated,
+
+def write_results(functions, func_addrs, rw_results, crt_results, propagated,
                   rw_modules, output_dir, verbose=False, stub_results=None):
     """
     Write all output files.
 
     Args:
         functions: Original function list.
+        func_addrs: Start address (int) of each function in functions.
         rw_results: RW identification results.
         crt_results: CRT identification results.
         propagated: Clustering/propagation results.
@@ -27,18 +29,22 @@ def write_results(functions, rw_results, crt_results, propagated,
     os.makedirs(output_dir, exist_ok=True)
     stub_results = stub_results or {}
 
-    # Build the enriched function database
-    enriched = _build_enriched_db(functions, rw_results, crt_results,
-                                  propagated, stub_results)
+    # Stream the enriched function database to disk, tallying categories
+    # and methods for the summary as the entries go by
+    cat_counts = Counter()
+    method_counts = Counter()
+    enriched = _iter_enriched_db(functions, func_addrs, rw_results,
+                                 crt_results, propagated, stub_results)
 
     # Write files
-    _write_json(os.path.join(output_dir, "identified_functions.json"), enriched)
+    _write_json_array(os.path.join(output_dir, "identified_functions.json"),
+                      _tally_entries(enriched, cat_counts, method_counts))
     _write_json(os.path.join(output_dir, "rw_modules.json"),
                 _serialize_rw_modules(rw_modules))
     _write_json(os.path.join(output_dir, "crt_functions.json"),
                 _serialize_crt(crt_results))
 
-    summary = _build_summary(enriched, rw_results, crt_results, propagated, rw_modules)
+    summary = _build_summary(cat_counts, method_counts, rw_modules)
     _write_json(os.path.join(output_dir, "summary.json"), summary)
 
     if verbose:
@@ -47,12 +53,18 @@ def write_results(functions, rw_results, crt_results, propagated,
     return summary
 
 
-def _build_enriched_db(functions, rw_results, crt_results, propagated,
-                       stub_results):
-    """Build enriched function entries with classification info."""
-    enriched = []
-    for f in functions:
-        addr = int(f["start"], 16)
+def _iter_enriched_db(functions, func_addrs, rw_results, crt_results,
+                      propagated, stub_results):
+    """Yield enriched function entries with classification info."""
+    # One lookup per function: sources merged lowest priority first, so
+    # CRT beats RW beats propagated beats stub where they overlap
+    classification = {}
+    for kind, results in (("stub", stub_results), ("propagated", propagated),
+                          ("rw", rw_results), ("crt", crt_results)):
+        classification.update((addr, (kind, info))
+                              for addr, info in results.items())
+
+    for f, addr in zip(functions, func_addrs):
         entry = {
             "start": f["start"],
             "end": f["end"],
@@ -61,21 +73,19 @@ def _build_enriched_db(functions, rw_results, crt_results, propagated,
             "section": f["section"],
         }
 
-        if addr in crt_results:
-            info = crt_results[addr]
+        kind, info = classification.get(addr, (None, None))
+        if kind == "crt":
             entry["category"] = "crt"
             entry["identified_name"] = info["name"]
             entry["confidence"] = info["confidence"]
             entry["method"] = info["method"]
-        elif addr in rw_results:
-            info = rw_results[addr]
+        elif kind == "rw":
             entry["category"] = info["category"]
             entry["module"] = info.get("module", "")
             entry["source_file"] = info.get("source_file", "")
             entry["confidence"] = info["confidence"]
             entry["method"] = info["method"]
-        elif addr in propagated:
-            info = propagated[addr]
+        elif kind == "propagated":
             entry["category"] = info["category"]
             entry["subcategory"] = info.get("subcategory")
             entry["confidence"] = info["confidence"]
@@ -83,8 +93,7 @@ def _build_enriched_db(functions, rw_results, crt_results, propagated,
             if "vtable_addr" in info:
                 entry["vtable_addr"] = f"0x{info['vtable_addr']:08X}"
                 entry["vtable_index"] = info["vtable_index"]
-        elif addr in stub_results:
-            info = stub_results[addr]
+        elif kind == "stub":
             entry["category"] = info["category"]
             entry["stub_type"] = info.get("stub_type", "")
             entry["confidence"] = info["confidence"]
@@ -94,16 +103,20 @@ def _build_enriched_db(functions, rw_results, crt_results, propagated,
             entry["confidence"] = 0.0
             entry["method"] = "none"
 
-        enriched.append(entry)
+        yield entry
 
-    return enriched
 
+def _tally_entries(entries, cat_counts, method_counts):
+    """Pass entries through, counting each one's category and method."""
+    for entry in entries:
+        cat_counts[entry["category"]] += 1
+        method_counts[entry["method"]] += 1
+        yield entry
 
-def _build_summary(enriched, rw_results, crt_results, propagated, rw_modules):
-    """Build summary statistics."""
-    total = len(enriched)
-    cat_counts = Counter(e["category"] for e in enriched)
-    method_counts = Counter(e["method"] for e in enriched)
+
+def _build_summary(cat_counts, method_counts, rw_modules):
+    """Build summary statistics from per-category and per-method counts."""
+    total = sum(cat_counts.values())
 
     # Group subcategories
     rw_total = sum(v for k, v in cat_counts.items() if k.startswith("rw_"))
@@ -113,7 +126,7 @@ def _build_summary(enriched, rw_results, crt_results, propagated, rw_modules):
     unknown_total = cat_counts.get("unknown", 0)
 
     # Count vtable functions specifically
-    vtable_total = sum(1 for e in enriched if e.get("method") in ("vtable_scan", "vtable_ctor"))
+    vtable_total = method_counts["vtable_scan"] + method_counts["vtable_ctor"]
 
     # RW modules with function counts
     rw_module_summary = {}
@@ -208,5 +221,23 @@ def _print_summary(summary):
 
 def _write_json(path, data):
     """Write data as formatted JSON."""
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(path, "wb") as f:
+        f.write(encode_json(data))
+
+
+def _write_json_array(path, items):
+    """
+    Write an iterable as a formatted JSON array, one item at a time.
+
+    The bytes match _write_json on the equivalent list, without the whole
+    list having to be built first.
+    """
+    with open(path, "wb") as f:
+        sep = b"[\n  "
+        for item in items:
+            f.write(sep)
+            # Nest the item's own indentation one level; JSON strings escape
+            # newlines, so every raw newline is a line break
+            f.write(encode_json(item).replace(b"\n", b"\n  "))
+            sep = b",\n  "
+        f.write(b"[]" if sep == b"[\n  " else b"\n]")
@@ -13,7 +13,8 @@ Strategy:
 """
 
 import re
-from collections import defaultdict
+from bisect import bisect_left, bisect_right
+from collections import Counter
 
 from . import config
 
@@ -23,6 +24,12 @@ MAX_ZONE_SIZE = 0x400
 # Padding around the inferred RW data region boundaries
 RW_DATA_REGION_PADDING = 0x200
 
+# RW source file ID string, e.g.
+# "@@(#)$Id: //RenderWare/RW36Active/rwsdk/src/babinary.c#3 $"
+_RW_ID_PATTERN = re.compile(
+    r'@@?\(?#\)?\$Id:\s*//RenderWare/RW36Active/rwsdk/(.+?)#\d+\s*\$'
+)
+
 
 def identify_rw_functions(strings, imm_refs, functions, verbose=False):
     """
@@ -61,6 +68,8 @@ def identify_rw_functions(strings, imm_refs, functions, verbose=False):
 
     # Step 4: Find seed functions via tight .rdata zones
     zones = _build_rdata_zones(rw_strings)
+    zone_starts = [z["start"] for z in zones]
+    zone_mids = [(z["start"] + z["end"]) // 2 for z in zones]
     if verbose:
         print(f"  Built {len(zones)} tight .rdata zones (max 0x{MAX_ZONE_SIZE:X})")
 
@@ -73,17 +82,19 @@ def identify_rw_functions(strings, imm_refs, functions, verbose=False):
                                rw["category"], rw["filename"], rw["path"],
                                config.CONFIDENCE_RW_STRING_REF, "rw_string_ref")
 
-    # Zone-based seeds
-    for rdata_addr, func_addrs in imm_refs.items():
-        if rdata_addr in rw_string_addrs:
-            continue
-        zone = _find_zone(rdata_addr, zones)
-        if zone is not None:
-            for func_addr in func_addrs:
-                if func_addr not in rw_results:
-                    _add_rw_result(rw_results, rw_modules, func_addr,
-                                   zone["category"], zone["filename"], zone["path"],
-                                   config.CONFIDENCE_RW_ZONE, "rw_zone")
+    # Zone-based seeds (without RW strings there are no zones to hit)
+    if zones:
+        for rdata_addr, func_addrs in imm_refs.items():
+            if rdata_addr in rw_string_addrs:
+                continue
+            zone = _find_zone(rdata_addr, zones, zone_starts)
+            if zone is not None:
+                for func_addr in func_addrs:
+                    if func_addr not in rw_results:
+                        _add_rw_result(rw_results, rw_modules, func_addr,
+                                       zone["category"], zone["filename"],
+                                       zone["path"],
+                                       config.CONFIDENCE_RW_ZONE, "rw_zone")
 
     seed_count = len(rw_results)
     if verbose:
@@ -94,11 +105,6 @@ def identify_rw_functions(strings, imm_refs, functions, verbose=False):
     # them and slightly beyond is RW-related. We use this fixed range
     # rather than bootstrapping from referenced addresses (which can
     # expand to cover all of .rdata).
-    func_to_rdata = defaultdict(set)
-    for rdata_addr, func_addrs in imm_refs.items():
-        for fa in func_addrs:
-            func_to_rdata[fa].add(rdata_addr)
-
     rw_string_addrs_list = sorted(rw_string_addrs.keys())
     if rw_string_addrs_list:
         # The RW data region spans from before the first RW string to
@@ -114,24 +120,34 @@ def identify_rw_functions(strings, imm_refs, functions, verbose=False):
         print(f"  RW data region: 0x{rw_data_lo:08X} - 0x{rw_data_hi:08X} "
               f"({(rw_data_hi - rw_data_lo) // 1024}KB)")
 
+    # References into the RW data region, picked out of imm_refs once for
+    # steps 6 and 7 (in imm_refs order); the region is empty without RW
+    # strings, so there is nothing to pick out
+    if rw_data_lo < rw_data_hi:
+        region_refs = [(rdata_addr, func_addrs)
+                       for rdata_addr, func_addrs in imm_refs.items()
+                       if rw_data_lo <= rdata_addr < rw_data_hi]
+    else:
+        region_refs = []
+
+    # Number of distinct RW data region addresses each function references
+    region_ref_counts = Counter(fa for _, func_addrs in region_refs
+                                for fa in set(func_addrs))
+
     # Step 6: Find functions referencing the RW data region
     # Require at least 2 references to .rdata within the RW region
     # (single refs could be coincidental)
     region_count = 0
-    for rdata_addr, func_addrs in imm_refs.items():
-        if not (rw_data_lo <= rdata_addr < rw_data_hi):
-            continue
+    for rdata_addr, func_addrs in region_refs:
         if rdata_addr in rw_string_addrs:
             continue
         for func_addr in func_addrs:
             if func_addr in rw_results:
                 continue
             # Check if this function has multiple refs into the RW data region
-            all_refs = func_to_rdata.get(func_addr, set())
-            rw_region_refs = sum(1 for r in all_refs if rw_data_lo <= r < rw_data_hi)
-            if rw_region_refs >= 2:
+            if region_ref_counts[func_addr] >= 2:
                 # Assign to nearest RW module by .rdata zone
-                best_zone = _find_nearest_zone(rdata_addr, zones)
+                best_zone = _find_nearest_zone(rdata_addr, zones, zone_mids)
                 cat = best_zone["category"] if best_zone else "rw_core"
                 mod = best_zone["filename"] if best_zone else "unknown"
                 path = best_zone["path"] if best_zone else ""
@@ -153,14 +169,12 @@ def identify_rw_functions(strings, imm_refs, functions, verbose=False):
         # Functions in the RW code range that reference the RW data region
         # even with just 1 reference
         code_region_count = 0
-        for rdata_addr, func_addrs in imm_refs.items():
-            if not (rw_data_lo <= rdata_addr < rw_data_hi):
-                continue
+        for rdata_addr, func_addrs in region_refs:
             for func_addr in func_addrs:
                 if func_addr in rw_results:
                     continue
                 if rw_code_lo <= func_addr <= rw_code_hi:
-                    best_zone = _find_nearest_zone(rdata_addr, zones)
+                    best_zone = _find_nearest_zone(rdata_addr, zones, zone_mids)
                     cat = best_zone["category"] if best_zone else "rw_core"
                     mod = best_zone["filename"] if best_zone else "unknown"
                     path = best_zone["path"] if best_zone else ""
@@ -198,9 +212,7 @@ def _add_rw_result(rw_results, rw_modules, func_addr, category, module,
 def _parse_rw_strings(strings):
     """Extract RenderWare ID strings and parse their paths."""
     rw_strings = []
-    rw_pattern = re.compile(
-        r'@@?\(?#\)?\$Id:\s*//RenderWare/RW36Active/rwsdk/(.+?)#\d+\s*\$'
-    )
+    rw_pattern = _RW_ID_PATTERN
 
     for s in strings:
         text = s["string"]
@@ -257,28 +269,32 @@ def _build_rdata_zones(rw_strings):
     return zones
 
 
-def _find_zone(rdata_addr, zones):
-    """Binary search for the zone containing rdata_addr."""
-    lo, hi = 0, len(zones) - 1
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        if zones[mid]["start"] <= rdata_addr < zones[mid]["end"]:
-            return zones[mid]
-        elif rdata_addr < zones[mid]["start"]:
-            hi = mid - 1
-        else:
-            lo = mid + 1
+def _find_zone(rdata_addr, zones, zone_starts):
+    """
+    Binary search for the zone containing rdata_addr.
+
+    zone_starts holds each zone's start; zones are sorted and disjoint, so
+    only the last zone starting at or before rdata_addr can contain it.
+    """
+    i = bisect_right(zone_starts, rdata_addr) - 1
+    if i >= 0 and rdata_addr < zones[i]["end"]:
+        return zones[i]
     return None
 
 
-def _find_nearest_zone(rdata_addr, zones):
-    """Find the nearest zone to a given .rdata address."""
-    best = None
-    best_dist = float("inf")
-    for z in zones:
-        mid = (z["start"] + z["end"]) // 2
-        dist = abs(rdata_addr - mid)
-        if dist < best_dist:
-            best_dist = dist
-            best = z
-    return best
+def _find_nearest_zone(rdata_addr, zones, zone_mids):
+    """
+    Find the zone whose midpoint is nearest to a given .rdata address.
+
+    zone_mids holds each zone's midpoint, which is non-decreasing since
+    the zones are sorted and disjoint, so only the midpoints either side
+    of rdata_addr need comparing. Ties go to the earliest zone.
+    """
+    k = bisect_left(zone_mids, rdata_addr)
+    if k == len(zone_mids) or (
+            k > 0 and rdata_addr - zone_mids[k - 1] <= zone_mids[k] - rdata_addr):
+        if k == 0:
+            return None  # No zones
+        # Earliest zone sharing the nearer midpoint below rdata_addr
+        k = bisect_left(zone_mids, zone_mids[k - 1])
+    return zones[k]
@@ -11,6 +11,8 @@ General pattern: F3 0F XX 05 [addr] repeated N times, ending with C3 (ret).
 Each SSE instruction is 8 bytes (prefix F3 0F + opcode + ModR/M 05 + 4-byte addr).
 """
 
+import re
+
 from . import config
 
 # SSE scalar float opcodes we recognize (after F3 0F prefix)
@@ -26,14 +28,19 @@ _SSE_OPCODES = {
     0x5F,  # maxss
 }
 
+# Function sizes an SSE chain can have: N >= 2 8-byte ops plus the ret,
+# up to ~120 bytes (longest observed chains)
+_CHAIN_SIZES = frozenset(range(2 * 8 + 1, 121, 8))
+
 
-def classify_stubs(xbe_data, functions, verbose=False):
+def classify_stubs(xbe_data, functions, func_addrs, verbose=False):
     """
     Identify formulaic stub functions by byte-pattern matching.
 
     Args:
         xbe_data: Raw bytes of the entire XBE file.
         functions: List of function dicts.
+        func_addrs: Start address (int) of each function in functions.
         verbose: Print progress info.
 
     Returns:
@@ -47,19 +54,22 @@ def classify_stubs(xbe_data, functions, verbose=False):
     results = {}
     by_type = {"float_copy": 0, "float_chain": 0, "double_op": 0}
 
-    for func in functions:
-        func_addr = int(func["start"], 16)
-        func_size = func.get("size", 0)
+    # Gate on size before touching any bytes: only a few functions have a
+    # size a chain can have, and only those need a file offset
+    candidates = [(func_addr, func.get("size", 0))
+                  for func, func_addr in zip(functions, func_addrs)
+                  if func.get("size", 0) in _CHAIN_SIZES]
+    file_offsets = config.va_to_file_offsets([a for a, _ in candidates])
+    data_len = len(xbe_data)
 
-        # Only check functions up to ~120 bytes (longest observed chains)
-        if func_size < 9 or func_size > 120:
-            continue
+    # Function bytes are sliced from a memoryview, so no copies are made
+    image = memoryview(xbe_data)
 
-        file_offset = config.va_to_file_offset(func_addr)
-        if file_offset is None or file_offset + func_size > len(xbe_data):
+    for (func_addr, func_size), file_offset in zip(candidates, file_offsets):
+        if file_offset is None or file_offset + func_size > data_len:
             continue
 
-        func_bytes = xbe_data[file_offset:file_offset + func_size]
+        func_bytes = image[file_offset:file_offset + func_size]
 
         # Check for SSE float chain: all 8-byte F3 0F XX 05 [addr] ops + C3
         if func_bytes[-1] == 0xC3 and func_bytes[0:2] == b'\xF3\x0F':
@@ -108,24 +118,23 @@ def _is_sse_chain(func_bytes, double=False):
     The chain ends with C3 (ret).
     Total size = N * 8 + 1 (where N >= 2).
     """
-    body_len = len(func_bytes) - 1  # exclude final C3
-    if body_len % 8 != 0:
-        return False
-    if body_len < 16:  # need at least 2 ops
-        return False
-
-    prefix = b'\xF2' if double else b'\xF3'
-
-    for i in range(0, body_len, 8):
-        if func_bytes[i] != prefix[0]:
-            return False
-        if func_bytes[i + 1] != 0x0F:
-            return False
-        opcode = func_bytes[i + 2]
-        if opcode not in _SSE_OPCODES:
-            return False
-        if func_bytes[i + 3] != 0x05:
-            return False
-        # bytes 4-7 are the address (any value is fine)
-
-    return True
+    return _SSE_CHAIN_PATTERNS[double].fullmatch(func_bytes) is not None
+
+
+def _build_sse_chain_pattern(prefix):
+    """
+    Regex for N >= 2 [prefix] 0F XX 05 [4-byte-addr] ops plus one final byte.
+
+    The opcode class is built from _SSE_OPCODES, so the regex engine does
+    the per-op checks. The final byte is left to the caller (ret check).
+    """
+    opcodes = b"".join(b"\\x%02X" % op for op in sorted(_SSE_OPCODES))
+    return re.compile(b"(?:\\x%02X\\x0F[" % prefix + opcodes +
+                      b"]\\x05.{4}){2,}.", re.DOTALL)
+
+
+# Keyed by _is_sse_chain's double flag: F3 = SSE float, F2 = SSE2 double
+_SSE_CHAIN_PATTERNS = {
+    False: _build_sse_chain_pattern(0xF3),
+    True: _build_sse_chain_pattern(0xF2),
+}
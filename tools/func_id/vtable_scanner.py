@@ -12,7 +12,9 @@ Constructors are identified by finding functions that write
 a vtable address into memory (the 'this->__vfptr = &vtable' pattern).
 """
 
+import re
 import struct
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 
 from . import config
@@ -26,13 +28,14 @@ MIN_VTABLE_ENTRIES = 3
 MAX_NULL_GAP = 0
 
 
-def scan_vtables(xbe_data, functions, imm_refs, verbose=False):
+def scan_vtables(xbe_data, functions, func_addrs, imm_refs, verbose=False):
     """
     Scan .rdata for C++ vtables and classify virtual methods.
 
     Args:
         xbe_data: Raw bytes of the entire XBE file.
         functions: List of function dicts from disassembly.
+        func_addrs: Start address (int) of each function in functions.
         imm_refs: Dict rdata_addr -> [func_addr, ...] from imm scanner.
         verbose: Print progress info.
 
@@ -49,9 +52,7 @@ def scan_vtables(xbe_data, functions, imm_refs, verbose=False):
             vtables: list of vtable dicts for output
     """
     # Build set of known function starts for validation
-    func_starts = set()
-    for f in functions:
-        func_starts.add(int(f["start"], 16))
+    func_starts = set(func_addrs)
 
     # Scan .rdata for vtable structures
     raw_vtables = _find_vtables(xbe_data, func_starts)
@@ -68,7 +69,8 @@ def scan_vtables(xbe_data, functions, imm_refs, verbose=False):
         print(f"  Total virtual methods: {total_entries}")
 
     # Find constructors: functions that embed vtable address literals
-    constructors = _find_constructors(vtables, xbe_data, functions)
+    constructors = _find_constructors(vtables, xbe_data, functions,
+                                      func_addrs)
 
     if verbose:
         print(f"  Constructors found: {len(constructors)}")
@@ -122,40 +124,22 @@ def _find_vtables(xbe_data, func_starts):
     text_hi = config.TEXT_VA_END
 
     rdata_bytes = xbe_data[rdata_raw:rdata_raw + rdata_size]
-    vtables = []
 
-    i = 0
-    while i < len(rdata_bytes) - 4:
-        # Align to 4 bytes
-        if i % 4 != 0:
-            i += 4 - (i % 4)
-            continue
+    # Every aligned dword that starts more than 4 bytes before the end
+    n_dwords = max(0, (len(rdata_bytes) - 5) // 4 + 1)
+    dwords = struct.unpack_from(f"<{n_dwords}I", rdata_bytes)
 
-        # Check if this could be start of a vtable
-        val = struct.unpack_from('<I', rdata_bytes, i)[0]
-        if val not in func_starts:
-            i += 4
-            continue
+    # One byte per dword, 1 where it points at a known function start; a
+    # vtable is any maximal run of at least MIN_VTABLE_ENTRIES such dwords
+    is_func_ptr = bytes(map(func_starts.__contains__, dwords))
+    vtable_run = re.compile(b"\x01{%d,}" % MIN_VTABLE_ENTRIES)
 
-        # Found a function pointer - scan forward for more
-        entries = []
-        j = i
-        while j < len(rdata_bytes) - 4:
-            val = struct.unpack_from('<I', rdata_bytes, j)[0]
-            if val in func_starts:
-                entries.append(val)
-                j += 4
-            else:
-                break
-
-        if len(entries) >= MIN_VTABLE_ENTRIES:
-            vtables.append({
-                "address": rdata_va + i,
-                "entries": entries,
-            })
-            i = j  # Skip past this vtable
-        else:
-            i += 4
+    vtables = []
+    for m in vtable_run.finditer(is_func_ptr):
+        vtables.append({
+            "address": rdata_va + m.start() * 4,
+            "entries": list(dwords[m.start():m.end()]),
+        })
 
     return vtables
 
@@ -196,7 +180,7 @@ def _filter_vtables(vtables, xbe_data):
     return filtered
 
 
-def _find_constructors(vtables, xbe_data, functions):
+def _find_constructors(vtables, xbe_data, functions, func_addrs):
     """
     Find constructor functions that embed vtable addresses as immediates.
 
@@ -216,30 +200,69 @@ def _find_constructors(vtables, xbe_data, functions):
     if not vtable_addrs:
         return {}
 
-    constructors = {}
+    # Position of each vtable in lookup order; when a function embeds
+    # several vtable addresses, the first vtable in this order wins
+    vtable_order = {addr_bytes: k for k, addr_bytes in enumerate(vtable_addrs)}
+    vtable_list = list(vtable_addrs.values())
 
-    for f in functions:
-        func_addr = int(f["start"], 16)
+    # Functions worth scanning, with their file offsets
+    candidates = []
+    data_len = len(xbe_data)
+    file_offsets = config.va_to_file_offsets(func_addrs)
+    for f, func_addr, file_offset in zip(functions, func_addrs, file_offsets):
         func_size = f.get("size", 0)
         if func_size < 8 or func_size > 8192:
             continue
 
-        file_offset = config.va_to_file_offset(func_addr)
-        if file_offset is None or file_offset + func_size > len(xbe_data):
+        if file_offset is None or file_offset + func_size > data_len:
             continue
+        candidates.append((func_addr, file_offset, func_size))
+
+    if not candidates:
+        return {}
+
+    # Find every vtable address literal in one pass over the span the
+    # functions cover, rather than searching each function for each vtable
+    span_lo = min(off for _, off, _ in candidates)
+    span_hi = max(off + size for _, off, size in candidates)
+    hit_offsets = []
+    hit_vtables = []
+    for m in _literal_pattern(vtable_addrs).finditer(xbe_data, span_lo, span_hi):
+        pos = m.start()
+        k = vtable_order.get(xbe_data[pos:pos + 4])
+        if k is not None:
+            hit_offsets.append(pos)
+            hit_vtables.append(k)
 
-        func_bytes = xbe_data[file_offset:file_offset + func_size]
+    constructors = {}
 
-        # Search for any vtable address literal in function bytes
-        for addr_bytes, vt in vtable_addrs.items():
-            pos = func_bytes.find(addr_bytes)
-            if pos >= 0:
-                # Don't classify vtable members as constructors
-                if func_addr not in vtable_methods:
-                    constructors[func_addr] = {
-                        "class_id": vt.get("class_id", "cls_???"),
-                        "vtable_addr": vt["address"],
-                    }
-                break  # One match is enough
+    for func_addr, file_offset, func_size in candidates:
+        # Literals lying wholly inside the function's bytes
+        lo = bisect_left(hit_offsets, file_offset)
+        hi = bisect_right(hit_offsets, file_offset + func_size - 4)
+        if lo < hi:
+            vt = vtable_list[min(hit_vtables[lo:hi])]
+            # Don't classify vtable members as constructors
+            if func_addr not in vtable_methods:
+                constructors[func_addr] = {
+                    "class_id": vt.get("class_id", "cls_???"),
+                    "vtable_addr": vt["address"],
+                }
 
     return constructors
+
+
+def _literal_pattern(literals):
+    """
+    Regex matching (zero-width) wherever one of the 4-byte literals may start.
+
+    Only the upper two bytes are checked, so the regex engine skips almost
+    every position and the caller confirms the few candidates it reports.
+    """
+    low_by_high = defaultdict(set)
+    for lit in literals:
+        low_by_high[lit[3]].add(lit[2])
+    alts = b"|".join(
+        b"[" + b"".join(b"\\x%02X" % lo for lo in sorted(lows)) + b"]\\x%02X" % hi
+        for hi, lows in sorted(low_by_high.items()))
+    return re.compile(b"(?=..(?:" + alts + b"))", re.DOTALL)
@@ -9,13 +9,14 @@ Output: a database of global variables with access patterns,
 inferred types, and structure groupings.
 """
 
-import json
 import os
 import struct
 import time
-from bisect import bisect_right
+from bisect import bisect_left, bisect_right
 from collections import Counter, defaultdict
 
+from ..jsonio import encode_json, load_json_file
+
 # Section ranges from XBE analysis
 TEXT_VA_START = 0x00011000
 TEXT_VA_SIZE = 2863616
@@ -43,6 +44,16 @@ MAX_STRUCT_FIELD_GAP = 256
 # Minimum fields to consider a group as a structure
 MIN_STRUCT_FIELDS = 3
 
+# Inferred size by gap to the next global, for gaps up to 16 bytes:
+# 1, 2 and 4 up to those gaps, the gap itself for 5-8, 8 (a double or
+# 64-bit value) for 9-16; larger gaps default to 4
+_GAP_SIZES = (1, 1, 2, 4, 4, 5, 6, 7, 8) + (8,) * 8
+# Largest of 4, 2 or 1 the address is aligned to, by address & 3
+_ALIGNED_SIZES = (4, 1, 2, 1)
+# Unpacker for the initial value of a global, by inferred size
+_VALUE_UNPACKERS = {size: struct.Struct(fmt).unpack_from
+                    for size, fmt in ((1, "<B"), (2, "<H"), (4, "<I"), (8, "<Q"))}
+
 
 def run(xbe_path, functions_path=None, xrefs_path=None, identified_path=None,
         strings_path=None, output_dir=None, verbose=False):
@@ -166,14 +177,6 @@ def _build_function_lookups(functions, identified):
     return func_starts, func_categories
 
 
-def _find_containing_function(addr, func_starts):
-    """Binary search to find the function containing an address."""
-    idx = bisect_right(func_starts, addr) - 1
-    if idx >= 0:
-        return func_starts[idx]
-    return None
-
-
 def _build_globals_from_xrefs(xrefs, func_starts, func_categories):
     """
     Build global variable database from xref data.
@@ -185,47 +188,66 @@ def _build_globals_from_xrefs(xrefs, func_starts, func_categories):
     """
     globals_db = {}
 
-    for xref in xrefs:
-        xref_type = xref["type"]
-        if xref_type not in ("data_read", "data_write"):
-            continue
-
-        target = int(xref["to"], 16)
-
-        # Only .data and .rdata globals
-        if DATA_VA_START <= target < DATA_VA_END:
-            section = ".data"
-        elif RDATA_VA_START <= target < RDATA_VA_END:
-            section = ".rdata"
-        else:
-            continue
-
-        source = int(xref["from"], 16)
-        func_addr = _find_containing_function(source, func_starts)
-        func_cat = func_categories.get(func_addr, "unknown") if func_addr else "unknown"
+    # Xrefs from one function tend to be listed together, so the address
+    # range (and category) of the last containing function is checked
+    # before bisecting
+    n_starts = len(func_starts)
+    range_lo, range_hi, func_addr, func_cat = 0, 0, None, "unknown"
+
+    # Filter in bulk: a comprehension picks out the data access xrefs
+    # before any per-xref work
+    accesses = [(xref["type"] == "data_read", xref["to"], xref["from"])
+                for xref in xrefs
+                if xref["type"] in ("data_read", "data_write")]
+
+    for is_read, target, source in accesses:
+        target = int(target, 16)
+
+        entry = globals_db.get(target)
+        if entry is None:
+            # Only .data and .rdata globals
+            if DATA_VA_START <= target < DATA_VA_END:
+                section = ".data"
+            elif RDATA_VA_START <= target < RDATA_VA_END:
+                section = ".rdata"
+            else:
+                continue
 
-        if target not in globals_db:
-            globals_db[target] = {
+            entry = globals_db[target] = {
                 "address": target,
                 "section": section,
                 "read_count": 0,
                 "write_count": 0,
                 "accessor_functions": set(),
-                "accessor_categories": Counter(),
+                # Category of each access, counted once the scan is done
+                "accessor_categories": [],
                 "inferred_size": 4,
                 "initial_value": None,
                 "classification": "unknown",
             }
 
-        entry = globals_db[target]
-        if xref_type == "data_read":
+        source = int(source, 16)
+        if not (range_lo <= source < range_hi):
+            pos = bisect_right(func_starts, source)
+            func_addr = func_starts[pos - 1] if pos else None
+            func_cat = func_categories.get(func_addr, "unknown") if func_addr else "unknown"
+            range_lo = func_addr if pos else -1
+            range_hi = func_starts[pos] if pos < n_starts else 1 << 32
+
+        if is_read:
             entry["read_count"] += 1
         else:
             entry["write_count"] += 1
 
         if func_addr:
             entry["accessor_functions"].add(func_addr)
-            entry["accessor_categories"][func_cat] += 1
+            entry["accessor_categories"].append(func_cat)
+
+    # Freeze the accessor sets into tuples (same iteration order, a
+    # fraction of the memory) now that no more accessors are added
+    for entry in globals_db.values():
+        entry["accessor_functions"] = tuple(entry["accessor_functions"])
+        entry["accessor_categories"] = Counter(entry["accessor_categories"])
 
     return globals_db
 
@@ -239,61 +261,38 @@ def _infer_sizes(globals_db):
     """
     sorted_addrs = sorted(globals_db.keys())
 
-    for i in range(len(sorted_addrs)):
-        addr = sorted_addrs[i]
-
-        if i + 1 < len(sorted_addrs):
-            gap = sorted_addrs[i + 1] - addr
-        else:
-            gap = 256  # last variable, default
+    # Gap to the next global; the last variable gets the default of 256
+    gaps = [b - a for a, b in zip(sorted_addrs, sorted_addrs[1:])]
+    gaps.append(256)
 
+    for addr, gap in zip(sorted_addrs, gaps):
         # Infer size from gap (round down to power of 2 or common size)
-        if gap <= 1:
-            size = 1
-        elif gap <= 2:
-            size = 2
-        elif gap <= 4:
-            size = 4
-        elif gap <= 8:
-            size = gap if gap in (5, 6, 7, 8) else 4
-        elif gap <= 16:
-            size = 8  # likely a double or 64-bit value
-        else:
-            size = 4  # default for large gaps (standalone variable)
+        size = _GAP_SIZES[gap] if gap <= 16 else 4
 
         # Alignment check: if address isn't aligned to inferred size, reduce
-        if size > 1 and addr % size != 0:
-            if addr % 4 == 0:
-                size = 4
-            elif addr % 2 == 0:
-                size = 2
-            else:
-                size = 1
+        if addr % size:
+            size = _ALIGNED_SIZES[addr & 3]
 
         globals_db[addr]["inferred_size"] = size
 
 
 def _read_initial_values(globals_db, xbe_data):
     """Read initial values from XBE for .data globals (not BSS)."""
+    data_len = len(xbe_data)
+
     for addr, entry in globals_db.items():
         raw_offset = _va_to_raw(addr, entry["section"])
         if raw_offset is None:
             continue
 
         size = entry["inferred_size"]
-        if raw_offset + size > len(xbe_data):
+        if raw_offset + size > data_len:
             continue
 
-        data = xbe_data[raw_offset:raw_offset + size]
-
-        if size == 1:
-            entry["initial_value"] = struct.unpack_from('<B', data)[0]
-        elif size == 2:
-            entry["initial_value"] = struct.unpack_from('<H', data)[0]
-        elif size == 4:
-            entry["initial_value"] = struct.unpack_from('<I', data)[0]
-        elif size == 8:
-            entry["initial_value"] = struct.unpack_from('<Q', data)[0]
+        # Only 1, 2, 4 and 8 byte globals get a value
+        unpack_from = _VALUE_UNPACKERS.get(size)
+        if unpack_from is not None:
+            entry["initial_value"] = unpack_from(xbe_data, raw_offset)[0]
 
 
 def _va_to_raw(va, section):
@@ -318,21 +317,27 @@ def _cross_reference_strings(globals_db, strings):
         addr = int(s["address"], 16)
         string_addrs[addr] = s["string"]
 
+    # String addresses split into four sorted lanes by address & 3; the
+    # strings 4-byte steps away from a global all sit in its own lane
+    lanes = ([], [], [], [])
+    for string_addr in sorted(string_addrs):
+        lanes[string_addr & 3].append(string_addr)
+
     for addr, entry in globals_db.items():
         # Check if this global IS a string reference or is near one
         if addr in string_addrs:
             entry["string_ref"] = string_addrs[addr]
         else:
-            # Check within ±64 bytes for nearby strings
-            for offset in range(-64, 65, 4):
-                nearby = addr + offset
-                if nearby in string_addrs:
-                    entry["nearby_string"] = {
-                        "address": f"0x{nearby:08X}",
-                        "offset": offset,
-                        "text": string_addrs[nearby],
-                    }
-                    break
+            # Check within ±64 bytes for nearby strings, lowest first
+            lane = lanes[addr & 3]
+            idx = bisect_left(lane, addr - 64)
+            if idx < len(lane) and lane[idx] <= addr + 64:
+                nearby = lane[idx]
+                entry["nearby_string"] = {
+                    "address": f"0x{nearby:08X}",
+                    "offset": nearby - addr,
+                    "text": string_addrs[nearby],
+                }
 
 
 def _detect_structures(globals_db):
@@ -572,8 +577,8 @@ def _print_summary(summary):
 
 def _write_json(path, data):
     """Write data as formatted JSON."""
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(path, "wb") as f:
+        f.write(encode_json(data))
 
 
 def _load_binary(path):
@@ -588,5 +593,4 @@ def _load_json(path):
     """Load a JSON file."""
     if not os.path.exists(path):
         raise FileNotFoundError(f"JSON file not found: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return load_json_file(path)
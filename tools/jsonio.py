@@ -0,0 +1,47 @@
+"""
+JSON encoding and decoding shared by the analysis tools.
+
+Uses orjson when it is installed and falls back to the stdlib json
+module, with identical output either way.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_json(data):
+    """
+    Encode data as UTF-8 JSON indented by two spaces.
+
+    orjson's two-space indented, non-ASCII preserving output matches
+    json.dumps(indent=2, ensure_ascii=False).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. ints wider than 64 bits; let json handle it
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def load_json_file(path):
+    """
+    Parse a UTF-8 JSON file.
+
+    Input orjson rejects (e.g. lone surrogate escapes) is re-parsed with
+    the stdlib json module, which accepts it.
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)